@@ -0,0 +1 @@
+"""Benchmarks for EcoEngineer (run from the repository root)."""
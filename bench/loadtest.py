@@ -0,0 +1,143 @@
+"""Concurrent-participant load test.
+
+Runs N scripted participants at once in this process, each playing the home
+page and all four systems (a wrong answer, then the right one, on every
+stage), and reports rerun latency percentiles, elements per rerun, peak RSS
+and cold-start time (``bench.startup``, measured first in a fresh process) as
+JSON::
+
+    python -m bench.loadtest --participants 20 --out bench_output.json
+    python -m bench.loadtest --participants 20 --compare bench_output.json
+
+Latency includes time queued behind other participants (script runs are
+serialised, as they are by the GIL in one server process); ``service_*`` is
+the script run alone. AppTest executes the whole script on every interaction,
+so figures are full-page and an upper bound for fragment reruns.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    latencies = [s[1] for s in samples]
+    service = [s[2] for s in samples]
+    elements = [s[3] for s in samples]
+    return {
+        "reruns": len(samples),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2),
+        "service_p50_ms": round(percentile(service, 50) * 1000, 2),
+        "service_p95_ms": round(percentile(service, 95) * 1000, 2),
+        "elements_mean": round(sum(elements) / len(elements), 1),
+        "elements_max": max(elements),
+    }
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run(participants, mistakes=True):
+    from bench.playthrough import Recorder, play_all
+    from bench.startup import cold_start
+
+    cold = cold_start()
+
+    recorders = [Recorder() for _ in range(participants)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=participants) as pool:
+        futures = [
+            pool.submit(play_all, rec, f"bench-{i}", mistakes)
+            for i, rec in enumerate(recorders)
+        ]
+        for future in futures:
+            future.result()
+    wall = time.perf_counter() - start
+
+    samples = [s for rec in recorders for s in rec.samples]
+    pages = sorted({s[0] for s in samples})
+    import streamlit
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "participants": participants,
+            "mistakes": mistakes,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "wall_s": round(wall, 2),
+        "reruns_per_s": round(len(samples) / wall, 1),
+        "peak_rss_mb": peak_rss_mb(),
+        "cold_start": cold,
+        "overall": summarize(samples),
+        "pages": {p: summarize([s for s in samples if s[0] == p]) for p in pages},
+    }
+
+
+def compare(result, baseline):
+    """Print p95 and element deltas against a previous result file."""
+    rows = [("overall", result["overall"], baseline["overall"])]
+    rows += [(p, r, baseline["pages"].get(p)) for p, r in result["pages"].items()]
+    for name, now, before in rows:
+        if not before:
+            continue
+        ratio = now["p95_ms"] / before["p95_ms"] if before["p95_ms"] else float("inf")
+        print(
+            f"{name:>8}: p95 {before['p95_ms']:.1f} -> {now['p95_ms']:.1f} ms ({ratio:.2f}x), "
+            f"elements {before['elements_mean']} -> {now['elements_mean']}"
+        )
+    if "cold_start" in baseline:
+        print(
+            f"cold start: {baseline['cold_start']['total_ms']:.0f} -> "
+            f"{result['cold_start']['total_ms']:.0f} ms"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--participants", type=int, default=10)
+    parser.add_argument("--no-mistakes", action="store_true", help="answer every stage correctly first time")
+    parser.add_argument("--out", default="bench_output.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="previous result file to diff against")
+    args = parser.parse_args(argv)
+
+    # Keep benchmark participants out of the real progress database.
+    os.environ.setdefault("ECOENGINEER_DB", os.path.join(tempfile.mkdtemp(), "bench.sqlite3"))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    result = run(args.participants, mistakes=not args.no_mistakes)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(
+        json.dumps(result["overall"]),
+        f"peak_rss_mb={result['peak_rss_mb']}",
+        f"cold_start_ms={result['cold_start']['total_ms']}",
+    )
+    if baseline:
+        compare(result, baseline)
+
+
+if __name__ == "__main__":
+    main()
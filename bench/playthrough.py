@@ -0,0 +1,157 @@
+"""Scripted participant playthroughs driven by ``streamlit.testing.v1.AppTest``.
+
+Answers come from the same stage table and variant pools the pages use, so
+playthroughs stay in sync with ``ecoengineer/stages.json``.
+"""
+import json
+import threading
+import time
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Block
+
+from ecoengineer import quiz, variants
+
+ROOT = Path(__file__).resolve().parent.parent
+HOME = ROOT / "app.py"
+PAGES = {
+    "solar": ROOT / "pages" / "1_Solar.py",
+    "wind": ROOT / "pages" / "2_Wind.py",
+    "hydro": ROOT / "pages" / "3_Hydro.py",
+    "biomass": ROOT / "pages" / "4_Biomass.py",
+}
+TIMEOUT = 30
+
+# AppTest swaps process-global runtime state on every run, so runs cannot
+# overlap. Concurrent participants queue on this lock, which models a single
+# server process whose script runs are serialised by the GIL.
+RUN_LOCK = threading.Lock()
+
+
+def stage_table():
+    with open(quiz.STAGES_PATH, encoding="utf-8") as f:
+        return quiz.parse_stage_table(json.load(f))
+
+
+def count_elements(node):
+    """Number of elements and blocks under ``node``."""
+    return sum(
+        1 + (count_elements(child) if isinstance(child, Block) else 0)
+        for child in getattr(node, "children", {}).values()
+    )
+
+
+def wrong_answer(stage):
+    if stage.kind == "arrange":
+        return tuple(stage.options) if tuple(stage.options) != stage.answer else stage.answer[::-1]
+    if stage.kind == "choice":
+        return next(o for o in stage.options if o != stage.answer)
+    lo, hi, _ = stage.bounds
+    return lo if abs(lo - stage.answer) >= stage.tolerance else hi
+
+
+def _widgets(at, stage, value):
+    """``(getter, value)`` per input widget of ``stage``; getters re-read the tree."""
+    if stage.kind == "arrange":
+        return [
+            (lambda i=i: at.selectbox(key=f"{stage.key}_{i}"), v) for i, v in enumerate(value)
+        ]
+    if stage.kind == "choice":
+        return [(lambda: at.radio(key=stage.key), value)]
+    lo = stage.bounds[0]
+    return [(lambda: at.number_input(key=stage.key), round(value) if isinstance(lo, int) else float(value))]
+
+
+def set_answer(at, stage, value, rerun=None):
+    """Enter ``value`` the way a browser would: each change to a widget that
+    is not inside a form triggers ``rerun()``; form widgets wait for submit."""
+    for widget, v in _widgets(at, stage, value):
+        w = widget()
+        if w.value == v:
+            continue
+        w.set_value(v)
+        if rerun is not None and not w.form_id:
+            rerun()
+
+
+def submit(at, stage):
+    """Click the stage's Check/Submit button (a form submit button in form mode)."""
+    form = quiz.form_key(stage)
+    button = next((b for b in at.button if b.form_id == form), None)
+    (button or at.button(key=stage.button_key)).click()
+
+
+class Recorder:
+    """Collects ``(page, latency, service, elements)`` for every rerun.
+
+    ``latency`` includes time spent queued behind other participants;
+    ``service`` is the script run alone.
+    """
+
+    def __init__(self):
+        self.samples = []
+
+    def run(self, at, page):
+        queued = time.perf_counter()
+        with RUN_LOCK:
+            start = time.perf_counter()
+            at.run(timeout=TIMEOUT)
+            done = time.perf_counter()
+        if at.exception:
+            raise RuntimeError(f"{page}: {at.exception[0].message}")
+        elements = count_elements(at.main) + count_elements(at.sidebar)
+        self.samples.append((page, done - queued, done - start, elements))
+        return at
+
+
+def carried(state):
+    """Session keys that survive page navigation (widget state does not)."""
+    return {k: v for k, v in state.items() if k in ("progress", "participant")}
+
+
+def play_home(rec, participant):
+    at = AppTest.from_file(str(HOME), default_timeout=TIMEOUT)
+    rec.run(at, "home")
+    at.text_input(key="participant_input").input(participant)
+    rec.run(at, "home")
+    return carried(at.session_state.filtered_state)
+
+
+def play_system(rec, name, system, session, mistakes=True, pools=None):
+    """Play every stage of ``system``; a wrong answer first when ``mistakes``.
+
+    Numeric stages are answered for the variant drawn for ``session``'s
+    participant, so a participant must be set when ``pools`` has templates.
+    """
+    pools = variants.build_pools({name: system}) if pools is None else pools
+    at = AppTest.from_file(str(PAGES[name]), default_timeout=TIMEOUT)
+    for key, value in session.items():
+        at.session_state[key] = value
+    rec.run(at, name)
+
+    def rerun():
+        rec.run(at, name)
+
+    for stage in system.stages:
+        _, stage = variants.pick(pools, session.get("participant"), stage)
+        if mistakes:
+            set_answer(at, stage, wrong_answer(stage), rerun)
+            submit(at, stage)
+            rec.run(at, name)
+            assert at.warning, f"{name}: expected a hint after a wrong answer"
+        set_answer(at, stage, stage.answer, rerun)
+        submit(at, stage)
+        rec.run(at, name)
+    assert at.session_state["progress"].is_completed(name), f"{name}: playthrough did not complete"
+    return carried(at.session_state.filtered_state)
+
+
+def play_all(rec, participant, mistakes=True):
+    """Home page, then all four systems in order, carrying progress across pages."""
+    table = stage_table()
+    pools = variants.build_pools(table)
+    session = play_home(rec, participant)
+    for name in PAGES:
+        session.update(play_system(rec, name, table[name], session, mistakes, pools))
+    return session
@@ -0,0 +1,57 @@
+"""Rerun counts for one scripted playthrough, live widgets vs. form input.
+
+Plays the home page and all four systems once per input mode. Widget changes
+are replayed the way a browser sends them: a change to a widget outside a form
+reruns the script at once, while form widgets wait for the submit button.
+Prints per-page and per-stage rerun counts for both modes as JSON::
+
+    python -m bench.reruns
+    python -m bench.reruns --no-mistakes --out reruns.json
+"""
+import argparse
+import json
+import os
+import tempfile
+from collections import Counter
+
+
+def count(form_input, mistakes=True):
+    from bench.playthrough import Recorder, play_all, stage_table
+    from ecoengineer import quiz
+
+    quiz.FORM_INPUT = form_input
+    rec = Recorder()
+    play_all(rec, f"reruns-{'form' if form_input else 'live'}", mistakes)
+    pages = Counter(page for page, *_ in rec.samples)
+    table = stage_table()
+    # The first run of each system page is the page load, not a stage.
+    per_stage = {
+        name: round((pages[name] - 1) / len(system.stages), 2) for name, system in table.items()
+    }
+    return {"total": len(rec.samples), "pages": dict(pages), "per_stage": per_stage}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--no-mistakes", action="store_true", help="answer every stage correctly first time")
+    parser.add_argument("--out", help="also write the result to this file")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("ECOENGINEER_DB", os.path.join(tempfile.mkdtemp(), "reruns.sqlite3"))
+    mistakes = not args.no_mistakes
+    live = count(False, mistakes)
+    form = count(True, mistakes)
+    result = {
+        "mistakes": mistakes,
+        "live": live,
+        "form": form,
+        "reduction": round(1 - form["total"] / live["total"], 3),
+    }
+    print(json.dumps(result, indent=2))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Throughput scaling across app processes sharing one progress database.
+
+A fixed number of scripted participants (``bench.playthrough``) is split
+across 1, 2, 4, ... worker processes, each standing in for one server process
+behind the reverse proxy in ``deploy/``. All workers share one SQLite file.
+Script runs are CPU-bound and serialised by the GIL within a process, so
+throughput should grow with process count up to the number of cores. After
+each round the parent reads the shared database back and checks that every
+participant's completed progress is visible from a process that played none
+of it::
+
+    python -m bench.scaling --participants 8 --processes 1 2 4 --out scaling.json
+
+AppTest drives the scripts directly, so proxy and websocket overhead are not
+included.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import tempfile
+import time
+
+from ecoengineer import SYSTEMS
+
+
+def _warm():
+    # Pay for imports before the clock starts, as a running server would have.
+    import bench.playthrough  # noqa: F401
+
+
+def _worker(participants, mistakes):
+    from bench.playthrough import Recorder, play_all
+    from ecoengineer import store
+
+    rec = Recorder()
+    start = time.time()
+    for participant in participants:
+        play_all(rec, participant, mistakes)
+    store.get_store().flush()
+    return len(rec.samples), sum(s[2] for s in rec.samples), start, time.time()
+
+
+def _verify(db_path, participants):
+    """Return participants whose completed progress is not in the shared database."""
+    from ecoengineer.progress import Progress
+    from ecoengineer.store import ProgressStore
+
+    shared = ProgressStore(db_path)
+    try:
+        records = dict(shared.items())
+    finally:
+        shared.close()
+    return [
+        p for p in participants
+        if p not in records
+        or not all(Progress.decode(records[p]).is_completed(s) for s in SYSTEMS)
+    ]
+
+
+def run_round(processes, participants, mistakes=True):
+    db_path = os.path.join(tempfile.mkdtemp(), "scaling.sqlite3")
+    os.environ["ECOENGINEER_DB"] = db_path
+    names = [f"scale-{processes}-{i}" for i in range(participants)]
+    shares = [names[i::processes] for i in range(processes)]
+
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(processes, initializer=_warm) as pool:
+        results = pool.starmap(_worker, [(share, mistakes) for share in shares if share])
+    wall = max(r[3] for r in results) - min(r[2] for r in results)
+
+    reruns = sum(r[0] for r in results)
+    return {
+        "processes": processes,
+        "participants": participants,
+        "reruns": reruns,
+        "wall_s": round(wall, 2),
+        "reruns_per_s": round(reruns / wall, 1),
+        "service_s": round(sum(r[1] for r in results), 2),
+        "missing_from_shared_store": _verify(db_path, names),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--participants", type=int, default=8)
+    parser.add_argument("-p", "--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--no-mistakes", action="store_true")
+    parser.add_argument("--out", default="scaling_output.json")
+    args = parser.parse_args(argv)
+
+    # Workers must not fight over the metrics port.
+    os.environ["ECOENGINEER_METRICS_PORT"] = "0"
+    rounds = []
+    for processes in args.processes:
+        result = run_round(processes, args.participants, mistakes=not args.no_mistakes)
+        base = rounds[0] if rounds else result
+        result["speedup"] = round(result["reruns_per_s"] / base["reruns_per_s"], 2)
+        result["efficiency"] = round(result["speedup"] * base["processes"] / processes, 2)
+        rounds.append(result)
+        print(json.dumps(result))
+
+    output = {
+        "meta": {
+            "python": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "rounds": rounds,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Cold-start budget: import time of the app's own modules, and first-run latency.
+
+``python -X importtime`` is run in a fresh interpreter for the modules that
+app.py and every page import at the top level, with ``streamlit`` imported
+first so its (unavoidable) cost is reported separately. Import times on a
+shared machine are noisy, so the fastest of ``--samples`` runs is used. The
+check fails (exit status 1) when the app's modules
+together exceed the budget, or when a module that should be imported lazily
+(``graphviz``, NumPy, Pillow) is pulled in at page import time::
+
+    python -m bench.startup                  # import budget
+    python -m bench.startup --budget-ms 40 --samples 9
+    python -m bench.startup --cold-start     # fresh-process first runs, as JSON
+"""
+import argparse
+import ast
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Not imported from bench.playthrough: that pulls in streamlit, which the
+# cold-start child must time itself.
+ROOT = Path(__file__).resolve().parent.parent
+HOME = ROOT / "app.py"
+SOLAR = ROOT / "pages" / "1_Solar.py"
+TIMEOUT = 30
+
+LAZY_MODULES = ("graphviz", "numpy", "PIL")
+BUDGET_MS = 50
+SAMPLES = 5
+
+
+def entry_modules(scripts=None):
+    """App modules imported at the top level of app.py and the pages.
+
+    Imports nested in a section (e.g. the simulators) run with the page's
+    content, after the header is drawn, and are not part of the budget.
+    """
+    scripts = scripts or [HOME, *sorted((ROOT / "pages").glob("*.py"))]
+    modules = set()
+    for script in scripts:
+        for node in ast.parse(script.read_text(encoding="utf-8")).body:
+            if isinstance(node, ast.ImportFrom) and node.module == "ecoengineer":
+                names = [f"ecoengineer.{alias.name}" for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                names = [node.module or ""]
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+            modules.update(name for name in names if name.startswith("ecoengineer."))
+    return tuple(sorted(modules))
+
+
+ENTRY_MODULES = entry_modules()
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def _env():
+    env = dict(os.environ)
+    env.setdefault("ECOENGINEER_DB", os.path.join(tempfile.mkdtemp(), "startup.sqlite3"))
+    env["ECOENGINEER_METRICS_PORT"] = "0"
+    return env
+
+
+def importtime(modules=ENTRY_MODULES):
+    """Return ``{module: (self_us, cumulative_us, depth)}`` for a fresh import."""
+    code = "import streamlit\n" + "\n".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=_env(), capture_output=True, text=True, check=True,
+    )
+    timings = {}
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return timings
+
+
+def _app_us(timings):
+    return sum(timings[m][1] for m in ENTRY_MODULES if m in timings and timings[m][2] == 0)
+
+
+def check(budget_ms=BUDGET_MS, samples=SAMPLES):
+    """Print the fastest of ``samples`` import profiles; return budget violations."""
+    timings = min((importtime() for _ in range(samples)), key=_app_us)
+    app_us = _app_us(timings)
+    print(f"streamlit: {timings['streamlit'][1] / 1000:.1f} ms (not budgeted)")
+    for name in ENTRY_MODULES:
+        if name in timings:
+            print(f"{name:>24}: {timings[name][1] / 1000:6.1f} ms")
+    print(f"{'app modules':>24}: {app_us / 1000:6.1f} ms (budget {budget_ms} ms, best of {samples})")
+
+    problems = []
+    if app_us / 1000 > budget_ms:
+        problems.append(f"app modules take {app_us / 1000:.1f} ms, over the {budget_ms} ms budget")
+    for name in LAZY_MODULES:
+        if name in timings:
+            problems.append(f"{name} is imported at page import time ({timings[name][1] / 1000:.1f} ms)")
+    return problems
+
+
+# --- Cold start ---
+def _first_runs():
+    """In a fresh process: time to import, then first run of home and a system page."""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    import ecoengineer.quiz  # noqa: F401  (the heaviest page import)
+
+    imported = time.perf_counter()
+    AppTest.from_file(str(HOME), default_timeout=TIMEOUT).run()
+    home = time.perf_counter()
+    AppTest.from_file(str(SOLAR), default_timeout=TIMEOUT).run()
+    solar = time.perf_counter()
+    return {
+        "import_ms": round((imported - start) * 1000, 1),
+        "home_first_run_ms": round((home - imported) * 1000, 1),
+        "solar_first_run_ms": round((solar - home) * 1000, 1),
+        "total_ms": round((solar - start) * 1000, 1),
+    }
+
+
+def cold_start():
+    """Measure ``_first_runs`` in a new interpreter (process start included)."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-m", "bench.startup", "--first-runs"],
+        cwd=ROOT, env=_env(), capture_output=True, text=True, check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--samples", type=int, default=SAMPLES, help="import runs; the fastest is checked")
+    parser.add_argument("--cold-start", action="store_true", help="measure first runs in a fresh process")
+    parser.add_argument("--first-runs", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.first_runs:
+        print(json.dumps(_first_runs()))
+        return
+    if args.cold_start:
+        print(json.dumps(cold_start(), indent=2))
+        return
+    problems = check(args.budget_ms, max(1, args.samples))
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
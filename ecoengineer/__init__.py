@@ -0,0 +1,3 @@
+"""Shared building blocks for the EcoEngineer pages."""
+
+SYSTEMS = ("solar", "wind", "hydro", "biomass")
@@ -0,0 +1,177 @@
+"""Local copies of remote media, served from Streamlit's static folder.
+
+Each referenced asset is fetched once, downscaled to the width it is
+displayed at and written to ``static/``. Pages link to it with a content-hash
+``?v=`` query, which makes the static handler send a long-lived Cache-Control
+header. A page never waits on a remote host. Until a local copy exists it
+links to a generated placeholder and starts the download in a background
+thread (the warm-up does the same), and a failed download is retried after
+``RETRY_SECONDS``.
+
+Run ``python -m ecoengineer.assets`` in the container build (while online) to
+bake the assets into the image.
+"""
+import hashlib
+import io
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from ecoengineer import singleflight
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+STATIC_URL = "app/static"
+FETCH_TIMEOUT = 5
+USER_AGENT = "EcoEngineer/1.0 (asset prefetch)"
+RETRY_SECONDS = 300
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Asset:
+    filename: str
+    url: str
+    width: int  # display width in CSS pixels
+    scale: int = 2  # keep enough pixels for HiDPI screens
+
+
+ASSETS = {
+    "logo": Asset(
+        filename="logo.png",
+        url="https://upload.wikimedia.org/wikipedia/en/thumb/7/7a/SRM_Institute_of_Science_and_Technology_Logo.svg/1200px-SRM_Institute_of_Science_and_Technology_Logo.svg.png",
+        width=300,
+    ),
+}
+
+
+def _fetch(url):
+    import urllib.request
+
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(req, timeout=FETCH_TIMEOUT) as resp:
+        return resp.read()
+
+
+def _downscale(data, max_width):
+    from PIL import Image  # deferred: Pillow pulls in NumPy, only needed on a cache miss
+
+    img = Image.open(io.BytesIO(data))
+    if img.width > max_width:
+        height = round(img.height * max_width / img.width)
+        img = img.resize((max_width, height), Image.LANCZOS)
+    out = io.BytesIO()
+    img.save(out, format="PNG", optimize=True)
+    return out.getvalue()
+
+
+def _placeholder(asset):
+    from PIL import Image, ImageDraw
+
+    width = asset.width * asset.scale
+    img = Image.new("RGB", (width, width // 3), "#2e7d32")
+    ImageDraw.Draw(img).text((16, 16), "EcoEngineer", fill="white")
+    out = io.BytesIO()
+    img.save(out, format="PNG")
+    return out.getvalue()
+
+
+def prepare(asset, refresh=False):
+    """Ensure a local copy of ``asset`` exists; return ``(filename, hash)``.
+
+    Falls back to a generated placeholder when the asset cannot be fetched.
+    """
+    path = STATIC_DIR / asset.filename
+
+    def build():
+        return _downscale(_fetch(asset.url), asset.width * asset.scale)
+
+    try:
+        if refresh:
+            singleflight.write_atomic(path, build())
+        else:
+            singleflight.build_once(path, build)
+    except OSError:
+        pass
+    if not path.exists():
+        path = STATIC_DIR / f"placeholder-{asset.filename}"
+        singleflight.build_once(path, lambda: _placeholder(asset))
+    return path.name, hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+
+
+# --- Background download ---
+_fetching = set()
+_retry_at = {}  # name -> monotonic time before which a failed fetch is not retried
+_fetch_lock = threading.Lock()
+
+
+def _claim(name):
+    """Reserve the download of ``name``; False if one is running or failed recently."""
+    with _fetch_lock:
+        if name in _fetching or time.monotonic() < _retry_at.get(name, 0):
+            return False
+        _fetching.add(name)
+        return True
+
+
+def _download(name):
+    # Caller holds the claim on ``name``.
+    asset = ASSETS[name]
+    try:
+        singleflight.build_once(
+            STATIC_DIR / asset.filename,
+            lambda: _downscale(_fetch(asset.url), asset.width * asset.scale),
+        )
+    except Exception as e:
+        _LOGGER.warning("Cannot fetch asset %s (%s); retrying in %ss", name, e, RETRY_SECONDS)
+        with _fetch_lock:
+            _retry_at[name] = time.monotonic() + RETRY_SECONDS
+    finally:
+        with _fetch_lock:
+            _fetching.discard(name)
+
+
+def fetch_missing():
+    """Download every asset that has no local copy yet; blocks (warm-up thread)."""
+    for name, asset in ASSETS.items():
+        if not (STATIC_DIR / asset.filename).exists() and _claim(name):
+            _download(name)
+
+
+# --- Request path ---
+_digests = {}  # (path, mtime_ns) -> content hash
+
+
+def _static_url(path):
+    key = (path, path.stat().st_mtime_ns)
+    digest = _digests.get(key)
+    if digest is None:
+        digest = _digests[key] = hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+    return f"{STATIC_URL}/{path.name}?v={digest}"
+
+
+def url(name):
+    """Static URL of ``name``'s local copy, or of its placeholder while the
+    download runs in the background; never touches the network."""
+    asset = ASSETS[name]
+    path = STATIC_DIR / asset.filename
+    if path.exists():
+        return _static_url(path)
+    if _claim(name):
+        threading.Thread(target=_download, args=(name,), name=f"asset-{name}", daemon=True).start()
+    path = STATIC_DIR / f"placeholder-{asset.filename}"
+    singleflight.build_once(path, lambda: _placeholder(asset))
+    return _static_url(path)
+
+
+def image_html(name):
+    """Return an ``<img>`` tag pointing at the static copy of ``name``."""
+    asset = ASSETS[name]
+    return f'<img src="{url(name)}" style="width:100%;max-width:{asset.width}px;" alt="{name}">'
+
+
+if __name__ == "__main__":
+    for name, asset in ASSETS.items():
+        print(name, prepare(asset, refresh=True))
@@ -0,0 +1,263 @@
+"""Append-only log of graded quiz attempts and a streaming report over it.
+
+Every Submit/Check click is appended to an in-memory deque; a background
+thread writes the queued lines to ``attempts.jsonl`` once per flush interval.
+When the file passes ``max_bytes`` it is renamed with a timestamp and a new
+file is started, so nothing is ever overwritten.
+
+The report reads the rotated files line by line and keeps only per-question
+counters (plus bounded tables for attempts-to-pass and common wrong answers),
+so memory stays flat however many lines the log holds::
+
+    python -m ecoengineer.attempts                  # all files in the log dir
+    python -m ecoengineer.attempts a.jsonl b.jsonl --json
+"""
+import atexit
+import collections
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+LOG_DIR = Path(
+    os.environ.get(
+        "ECOENGINEER_ATTEMPT_LOG",
+        Path(__file__).resolve().parent.parent / ".cache" / "attempts",
+    )
+)
+MAX_BYTES = 64 * 1024 * 1024
+FLUSH_INTERVAL = 1.0
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AttemptLog:
+    """Buffered, size-rotated JSONL writer."""
+
+    def __init__(self, directory=LOG_DIR, max_bytes=MAX_BYTES, flush_interval=FLUSH_INTERVAL):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / "attempts.jsonl"
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self._queue = collections.deque()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="attempt-log", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def append(self, record):
+        """Queue one attempt (a JSON-serializable dict); never blocks on disk."""
+        self._queue.append(record)
+
+    def flush(self):
+        """Write everything queued so far; return the number of lines.
+
+        If the write fails the records go back to the front of the queue and
+        the error is raised.
+        """
+        with self._write_lock:
+            records = []
+            while self._queue:
+                records.append(self._queue.popleft())
+            if not records:
+                return 0
+            lines = [json.dumps(r, separators=(",", ":")) for r in records]
+            try:
+                # One unbuffered O_APPEND write per flush, so several server
+                # processes can share the file without interleaving lines.
+                with open(self.path, "ab", buffering=0) as f:
+                    f.write(("\n".join(lines) + "\n").encode("utf-8"))
+                    size = f.tell()
+            except BaseException:
+                self._queue.extendleft(reversed(records))
+                raise
+            if size >= self.max_bytes:
+                stamp = time.strftime("%Y%m%d-%H%M%S")
+                try:
+                    self.path.rename(self.directory / f"attempts-{stamp}-{os.getpid()}.jsonl")
+                except FileNotFoundError:
+                    pass  # another process rotated it first
+            return len(records)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+
+    def _run(self):
+        while not self._closed:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                # e.g. a full disk; the records stay queued for the next try.
+                _LOGGER.exception("Attempt log flush failed")
+
+
+@st.cache_resource(show_spinner=False)
+def get_log():
+    """The process-wide attempt log."""
+    return AttemptLog()
+
+
+def record(system, stage, answer, correct, variant=None):
+    """Log one graded submission from the current session.
+
+    ``variant`` is the index of the parametric question shown, if any.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    entry = {
+        "ts": round(time.time(), 3),
+        "session": ctx.session_id if ctx else None,
+        "participant": st.session_state.get("participant") or None,
+        "system": system,
+        "stage": stage,
+        "answer": list(answer) if isinstance(answer, tuple) else answer,
+        "correct": bool(correct),
+    }
+    if variant is not None:
+        entry["variant"] = variant
+    get_log().append(entry)
+
+
+# --- Streaming report ---
+class TopK:
+    """Misra-Gries heavy hitters: approximate top answers in bounded memory."""
+
+    def __init__(self, capacity=32):
+        self.capacity = capacity
+        self.counts = {}
+
+    def add(self, key):
+        if key in self.counts or len(self.counts) < self.capacity:
+            self.counts[key] = self.counts.get(key, 0) + 1
+            return
+        for k in list(self.counts):
+            self.counts[k] -= 1
+            if not self.counts[k]:
+                del self.counts[k]
+
+    def most_common(self, n):
+        return sorted(self.counts.items(), key=lambda kv: -kv[1])[:n]
+
+
+class QuestionStats:
+    __slots__ = ("attempts", "correct", "passes", "tries_to_pass", "wrong")
+
+    def __init__(self):
+        self.attempts = 0
+        self.correct = 0
+        self.passes = 0
+        self.tries_to_pass = collections.Counter()  # 1, 2, 3, 4 (meaning 4+)
+        self.wrong = TopK()
+
+
+def _answer_key(answer):
+    if isinstance(answer, list):
+        return " → ".join(map(str, answer))
+    if isinstance(answer, float):
+        return f"{answer:.4g}"
+    return str(answer)
+
+
+def aggregate(lines, max_open=100_000):
+    """Fold attempt lines into ``{(system, stage): QuestionStats}``.
+
+    Wrong answers to a templated stage are counted per variant (``"v3: 12.5"``),
+    since each variant asks for a different number.
+
+    ``max_open`` caps how many (session, question) pairs that have not passed
+    yet are tracked for attempts-to-pass; the oldest are dropped beyond that.
+    """
+    stats = {}
+    open_tries = collections.OrderedDict()
+    for line in lines:
+        if not line.strip():
+            continue
+        rec = json.loads(line)
+        question = (rec["system"], rec["stage"])
+        q = stats.get(question)
+        if q is None:
+            q = stats[question] = QuestionStats()
+        q.attempts += 1
+        who = (rec.get("participant") or rec.get("session"), question)
+        tries = open_tries.pop(who, 0) + 1
+        if rec["correct"]:
+            q.correct += 1
+            q.passes += 1
+            q.tries_to_pass[min(tries, 4)] += 1
+        else:
+            answer = _answer_key(rec["answer"])
+            variant = rec.get("variant")
+            q.wrong.add(answer if variant is None else f"v{variant}: {answer}")
+            open_tries[who] = tries
+            if len(open_tries) > max_open:
+                open_tries.popitem(last=False)
+    return stats
+
+
+def read_lines(paths):
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            yield from f
+
+
+def log_files(directory=LOG_DIR):
+    """Rotated files oldest first, then the live file."""
+    directory = Path(directory)
+    rotated = sorted(directory.glob("attempts-*.jsonl"))
+    live = directory / "attempts.jsonl"
+    return rotated + ([live] if live.exists() else [])
+
+
+def report(stats, top=3):
+    rows = []
+    for (system, stage), q in sorted(stats.items()):
+        passed = sum(q.tries_to_pass.values())
+        mean = sum(k * v for k, v in q.tries_to_pass.items()) / passed if passed else None
+        rows.append({
+            "system": system,
+            "stage": stage,
+            "attempts": q.attempts,
+            "accuracy": round(q.correct / q.attempts, 3),
+            "passes": q.passes,
+            "mean_attempts_to_pass": round(mean, 2) if mean is not None else None,
+            "attempts_to_pass": {("4+" if k == 4 else str(k)): v for k, v in sorted(q.tries_to_pass.items())},
+            "common_wrong_answers": q.wrong.most_common(top),
+        })
+    return rows
+
+
+def main(argv=None):
+    import argparse  # CLI only; kept out of page imports
+
+    parser = argparse.ArgumentParser(description="Per-question difficulty report from attempt logs.")
+    parser.add_argument("files", nargs="*", help=f"log files (default: everything in {LOG_DIR})")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    parser.add_argument("--top", type=int, default=3, help="common wrong answers to show")
+    args = parser.parse_args(argv)
+
+    rows = report(aggregate(read_lines(args.files or log_files())), top=args.top)
+    if args.json:
+        json.dump(rows, sys.stdout, indent=2, ensure_ascii=False)
+        print()
+        return
+    for r in rows:
+        wrong = "; ".join(f"{a} ({n})" for a, n in r["common_wrong_answers"]) or "-"
+        print(
+            f"{r['system']:>8} stage {r['stage']}: {r['attempts']:>7} attempts, "
+            f"{r['accuracy']:.0%} correct, {r['mean_attempts_to_pass'] or '-'} tries to pass | {wrong}"
+        )
+
+
+if __name__ == "__main__":
+    main()
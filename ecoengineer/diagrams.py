@@ -0,0 +1,78 @@
+"""Pre-rendered system diagrams.
+
+Each DOT graph is laid out once on the server with the ``graphviz`` package and
+the resulting SVG is stored in a content-hashed on-disk cache, built by one
+process at a time (see ``singleflight``), so browsers get a finished image
+instead of laying the graph out client-side on every rerun.
+When the ``dot`` binary is missing we fall back to ``st.graphviz_chart``. The
+``graphviz`` package is imported only when a diagram is first rendered.
+"""
+import hashlib
+from pathlib import Path
+
+import streamlit as st
+
+from ecoengineer import metrics, singleflight
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache" / "diagrams"
+
+DIAGRAMS = {
+    "solar": """
+digraph {
+  node [shape=box, style=rounded];
+  Sunlight -> PV_Panel -> Charge_Controller -> Battery -> Inverter -> AC_Load;
+}
+""",
+    "wind": """
+digraph {
+  Wind -> Blades -> Gearbox -> Generator -> Transformer -> Grid;
+}
+""",
+    "hydro": """
+digraph {
+  Reservoir -> Penstock -> Turbine -> Generator -> Grid;
+  Turbine -> Tailrace;
+}
+""",
+    "biomass": """
+digraph {
+  Fuel -> Furnace -> Boiler -> Turbine -> Generator -> Grid;
+}
+""",
+}
+
+
+def cache_path(dot):
+    """Return the on-disk cache location for a DOT source."""
+    digest = hashlib.sha256(dot.encode("utf-8")).hexdigest()[:16]
+    return CACHE_DIR / f"{digest}.svg"
+
+
+def _layout(dot):
+    import graphviz
+
+    try:
+        return graphviz.Source(dot).pipe(format="svg")
+    except graphviz.ExecutableNotFound:
+        return None
+
+
+@st.cache_resource(show_spinner=False)
+def render_svg(dot):
+    """Return SVG markup for ``dot``, or None if Graphviz is not installed."""
+    path = cache_path(dot)
+    singleflight.build_once(path, lambda: _layout(dot))
+    if not path.exists():
+        return None
+    return path.read_text(encoding="utf-8")
+
+
+def show(name):
+    """Display the diagram for ``name`` as a cached SVG image."""
+    with metrics.section(name, "diagram"):
+        dot = DIAGRAMS[name]
+        svg = render_svg(dot)
+        if svg is None:
+            st.graphviz_chart(dot)
+        else:
+            st.image(svg)
@@ -0,0 +1,166 @@
+"""Offline batch grader for exported answer sheets.
+
+Grades a CSV of answers against the same stage table the live pages use
+(``stages.json``) with NumPy column operations. Expected columns are
+``participant`` plus one ``<system>_<stage>`` column per stage:
+
+* arrangement stages: the four components in order, separated by ``|`` or ``>``;
+* multiple choice: the option text, or its letter (``A``-``D``);
+* numeric: the number; it is correct within the stage's tolerance.
+
+Numeric stages are graded against the fixed instance in ``stages.json``, not
+the per-session variants. Missing columns and blank cells score zero. Usage::
+
+    python -m ecoengineer.grader answers.csv -o scored.csv
+    python -m ecoengineer.grader --template > answers.csv
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+
+import numpy as np
+
+from ecoengineer import SYSTEMS, quiz
+
+_SEPARATOR = re.compile(r"\s*[|>]\s*")
+
+
+def load_table():
+    with open(quiz.STAGES_PATH, encoding="utf-8") as f:
+        return quiz.parse_stage_table(json.load(f))
+
+
+def columns(table):
+    return [f"{s}_{n}" for s in SYSTEMS for n in range(1, len(table[s].stages) + 1)]
+
+
+def _by_unique(values, fn, dtype):
+    """Apply ``fn`` once per distinct cell and broadcast back to the column."""
+    uniques, inverse = np.unique(values, return_inverse=True)
+    return np.array([fn(u) for u in uniques], dtype=dtype)[inverse]
+
+
+def _arrangement(stage):
+    expected = "|".join(stage.answer).casefold()
+    return lambda cell: "|".join(_SEPARATOR.split(cell.strip())).casefold() == expected
+
+
+def _choice(stage):
+    accepted = {stage.answer.casefold()}
+    accepted.add("abcdefgh"[stage.options.index(stage.answer)])
+    return lambda cell: cell.strip().casefold() in accepted
+
+
+def _number(cell):
+    try:
+        return float(cell)
+    except ValueError:
+        return np.nan
+
+
+def _numbers(values):
+    """Parse a column of numeric strings; blanks and junk become NaN."""
+    values = np.char.strip(values)
+    try:
+        return np.where(values == "", "nan", values).astype(float)
+    except ValueError:
+        # Unparsable cells: parse each distinct value once instead.
+        return _by_unique(values, _number, float)
+
+
+def grade_column(stage, values):
+    """Boolean array: which cells in ``values`` answer ``stage`` correctly."""
+    if stage.kind == "numeric":
+        numbers = _numbers(values)
+        # NaN (blank or unparsable) compares False.
+        return np.abs(numbers - stage.answer) < stage.tolerance
+    check = _arrangement(stage) if stage.kind == "arrange" else _choice(stage)
+    return _by_unique(values, check, bool)
+
+
+def grade(header, rows, table):
+    """Grade ``rows`` (lists of str); return participants, per-stage points, totals.
+
+    Short rows are padded with blanks and cells past the header are ignored.
+    """
+    width = len(header)
+    data = np.array([(row + [""] * width)[:width] for row in rows], dtype=str).reshape(len(rows), width)
+    index = {name: i for i, name in enumerate(header)}
+    participants = data[:, index["participant"]] if "participant" in index else np.arange(len(rows)).astype(str)
+    points = {}
+    for system in SYSTEMS:
+        for n, stage in enumerate(table[system].stages, 1):
+            col = f"{system}_{n}"
+            if col in index:
+                points[col] = grade_column(stage, data[:, index[col]]).astype(np.int16) * stage.points
+            else:
+                points[col] = np.zeros(len(rows), dtype=np.int16)
+    totals = {
+        system: np.sum([points[f"{system}_{n}"] for n in range(1, len(table[system].stages) + 1)], axis=0)
+        for system in SYSTEMS
+    }
+    return participants, points, totals
+
+
+def write_results(out, participants, points, totals):
+    stage_cols = list(points)
+    writer = csv.writer(out)
+    writer.writerow(
+        ["participant", *stage_cols, *(f"{s}_total" for s in SYSTEMS), "total"]
+    )
+    overall = np.sum(list(totals.values()), axis=0)
+    matrix = np.column_stack([*(points[c] for c in stage_cols), *(totals[s] for s in SYSTEMS), overall])
+    writer.writerows([p, *row] for p, row in zip(participants.tolist(), matrix.tolist()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade exported answer sheets.")
+    parser.add_argument("answers", nargs="?", help="CSV of answers")
+    parser.add_argument("-o", "--out", help="scored CSV (default: stdout)")
+    parser.add_argument("--template", action="store_true", help="print an empty answer sheet header")
+    args = parser.parse_args(argv)
+
+    table = load_table()
+    if args.template:
+        csv.writer(sys.stdout).writerow(["participant", *columns(table)])
+        return
+    if not args.answers:
+        parser.error("answers CSV is required")
+
+    start = time.perf_counter()
+    # utf-8-sig: spreadsheet exports often start with a byte order mark.
+    with open(args.answers, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        try:
+            header = [h.strip() for h in next(reader)]
+        except StopIteration:
+            parser.error(f"{args.answers} is empty")
+        rows = []
+        for row in reader:
+            # A trailing comma adds a blank cell; anything else is misaligned.
+            if any(cell.strip() for cell in row[len(header):]):
+                parser.error(f"{args.answers}:{reader.line_num}: more cells than header columns")
+            rows.append(row)
+    participants, points, totals = grade(header, rows, table)
+
+    if args.out:
+        with open(args.out, "w", newline="", encoding="utf-8") as out:
+            write_results(out, participants, points, totals)
+    else:
+        write_results(sys.stdout, participants, points, totals)
+
+    elapsed = time.perf_counter() - start
+    if not rows:
+        print("No rows to grade", file=sys.stderr)
+        return
+    summary = ", ".join(
+        f"{s} {totals[s].mean():.2f}/{table[s].max_score}" for s in SYSTEMS
+    )
+    print(f"Graded {len(rows)} rows in {elapsed:.2f}s; mean {summary}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Background process pool for computations too heavy for a script run.
+
+A script run holds its session until it finishes, and every session in the
+server process shares one GIL, so a multi-second computation would stall the
+quiz for everybody. ``submit(fn, *args)`` hands the call to a pool of
+``$ECOENGINEER_JOB_WORKERS`` worker processes (default: half the cores, at
+least one; ``0`` runs jobs on a thread in this process instead) and returns a
+``Job`` at once.
+
+Jobs are keyed by a hash of the function and its arguments. Submitting the
+same call again, from any session, returns the existing job, and finished jobs
+stay around (up to ``KEEP_FINISHED``) as a shared result cache. Inside a job,
+``report(done, total, message)`` sends progress back to the server process.
+A page shows it with ``placeholder(job)``: a fragment polls the job, draws a
+progress bar while it runs, and reruns the page once when the result is ready.
+
+Job functions must be importable module-level functions with picklable
+arguments and results. Each job's run time is recorded as ``jobs/<function>``
+in ``metrics``. Worker processes are forked from a fork server; where there is
+none (Windows) jobs run on a thread, as with ``0`` workers.
+"""
+import hashlib
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import streamlit as st
+
+from ecoengineer import metrics
+
+# Forking the threaded server directly is unsafe; a fork server starts clean
+# once, preloading only this module, and forks workers from there.
+FORKSERVER = "forkserver" in multiprocessing.get_all_start_methods()
+WORKERS = int(os.environ.get("ECOENGINEER_JOB_WORKERS", max(1, (os.cpu_count() or 2) // 2))) if FORKSERVER else 0
+KEEP_FINISHED = 256
+POLL_SECONDS = 0.5
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def job_key(fn, args):
+    """Stable hash of a call: same function and arguments, same key."""
+    payload = pickle.dumps((fn.__module__, fn.__qualname__, args), protocol=4)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class Job:
+    """Handle on one submitted call; progress is updated by the pool."""
+
+    def __init__(self, key, name, future):
+        self.key = key
+        self.name = name
+        self.future = future
+        self.submitted = time.monotonic()
+        self.progress = 0.0
+        self.message = ""
+
+    def done(self):
+        return self.future.done()
+
+    def result(self):
+        """The return value; raises the job's exception if it failed."""
+        return self.future.result()
+
+    @property
+    def error(self):
+        return self.future.exception() if self.future.done() else None
+
+
+# --- Worker side ---
+_progress_queue = None
+_current = threading.local()
+
+# A new worker re-imports the parent's ``__main__`` from its path, and under
+# Streamlit that is whichever page script is running. Job functions live in
+# importable modules, so workers never need it. Module-level code here runs in
+# the server and, through the preload, in the fork server; only processes
+# forked from the fork server ever call ``spawn.prepare``, so this only turns
+# the re-import off in workers, without touching the server's ``__main__``.
+if FORKSERVER:
+    from multiprocessing import spawn
+
+    spawn._fixup_main_from_path = lambda main_path: None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _run(key, fn, args):
+    _current.key = key
+    try:
+        return fn(*args)
+    finally:
+        _current.key = None
+
+
+def report(done, total=1, message=""):
+    """Report progress from inside a job; does nothing outside one."""
+    key = getattr(_current, "key", None)
+    if _progress_queue is not None and key is not None:
+        _progress_queue.put((key, done / total if total else 1.0, message))
+
+
+# --- Server side ---
+class JobPool:
+    """Deduplicating front end to a process (or thread) pool."""
+
+    def __init__(self, workers=WORKERS, keep=KEEP_FINISHED):
+        self.workers = workers
+        self.keep = keep
+        self.deduplicated = 0
+        if workers > 0:
+            self._context = multiprocessing.get_context("forkserver")
+            self._context.set_forkserver_preload([__name__])
+            self._queue = self._context.Queue()
+        else:
+            self._queue = queue.Queue()
+            _init_worker(self._queue)
+        self._executor = self._new_executor()
+        self._jobs = OrderedDict()  # key -> Job, oldest first
+        self._lock = threading.Lock()
+        threading.Thread(target=self._listen, name="job-progress", daemon=True).start()
+
+    def _new_executor(self):
+        if self.workers > 0:
+            return ProcessPoolExecutor(
+                self.workers, mp_context=self._context,
+                initializer=_init_worker, initargs=(self._queue,),
+            )
+        return ThreadPoolExecutor(1, thread_name_prefix="job")
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def submit(self, fn, *args):
+        """Start ``fn(*args)`` in the pool, or return the job already doing it."""
+        key = job_key(fn, args)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.error is None:
+                self._jobs.move_to_end(key)
+                self.deduplicated += 1
+                return job
+            try:
+                future = self._executor.submit(_run, key, fn, args)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); start a fresh pool.
+                _LOGGER.warning("Job pool broken; restarting it")
+                self._executor = self._new_executor()
+                future = self._executor.submit(_run, key, fn, args)
+            job = self._jobs[key] = Job(key, fn.__name__, future)
+            future.add_done_callback(lambda f, job=job: self._finished(job))
+            self._trim()
+        return job
+
+    def _finished(self, job):
+        job.progress = 1.0
+        metrics.REGISTRY.observe("jobs", job.name, time.monotonic() - job.submitted)
+        if job.error is not None:
+            _LOGGER.error("Job %s failed", job.name, exc_info=job.error)
+
+    def _trim(self):
+        finished = [key for key, job in self._jobs.items() if job.done()]
+        for key in finished[: max(0, len(finished) - self.keep)]:
+            del self._jobs[key]
+
+    def _listen(self):
+        while True:
+            try:
+                key, fraction, message = self._queue.get()
+            except (EOFError, OSError):
+                return
+            job = self._jobs.get(key)
+            if job is not None and not job.done():
+                job.progress, job.message = fraction, message
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The process-wide pool; created on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = JobPool()
+    return _pool
+
+
+def submit(fn, *args):
+    return get_pool().submit(fn, *args)
+
+
+def placeholder(job, text="Working…"):
+    """Show ``job``'s progress in place; rerun the page once it has finished."""
+
+    @st.fragment(run_every=POLL_SECONDS)
+    def _poll():
+        if job.done():
+            st.rerun()
+        st.progress(job.progress, text=job.message or text)
+
+    _poll()
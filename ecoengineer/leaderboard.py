@@ -0,0 +1,147 @@
+"""Cross-participant leaderboard with incrementally maintained rankings.
+
+Scores are small bounded integers (0-10 per system, 0-40 overall), so each
+ranking is a Fenwick tree of participant counts per score plus a bucket of
+participants per score. A score change is an O(log S) update and a rank
+lookup an O(log S) prefix sum; nothing is recomputed from the store on
+refresh. Page reads go through a short-TTL ``st.cache_data`` snapshot so many
+viewers polling at once share one build. Saves made by other server processes
+on the same database arrive through the progress store's poll.
+"""
+import threading
+
+import streamlit as st
+
+from ecoengineer import SYSTEMS, progress, store
+
+SYSTEM_MAX = 10
+OVERALL_MAX = SYSTEM_MAX * len(SYSTEMS)
+READ_TTL = 3  # seconds
+
+
+class RankIndex:
+    """Ranks participants by an integer score in ``[0, max_score]``."""
+
+    def __init__(self, max_score):
+        self.max_score = max_score
+        self._tree = [0] * (max_score + 2)  # 1-based Fenwick tree over score
+        self._buckets = [set() for _ in range(max_score + 1)]
+        self._scores = {}
+
+    def __len__(self):
+        return len(self._scores)
+
+    def _add(self, score, delta):
+        i = score + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _count_upto(self, score):
+        i, total = score + 1, 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def set(self, participant, score):
+        score = max(0, min(self.max_score, score))
+        old = self._scores.get(participant)
+        if old == score:
+            return
+        if old is not None:
+            self._add(old, -1)
+            self._buckets[old].discard(participant)
+        self._add(score, 1)
+        self._buckets[score].add(participant)
+        self._scores[participant] = score
+
+    def remove(self, participant):
+        old = self._scores.pop(participant, None)
+        if old is not None:
+            self._add(old, -1)
+            self._buckets[old].discard(participant)
+
+    def rank(self, participant):
+        """1-based competition rank (ties share a rank), or None if unranked."""
+        score = self._scores.get(participant)
+        if score is None:
+            return None
+        return len(self._scores) - self._count_upto(score) + 1
+
+    def top(self, n):
+        """Return up to ``n`` ``(rank, participant, score)`` rows, best first."""
+        rows, ahead = [], 0
+        for score in range(self.max_score, -1, -1):
+            bucket = self._buckets[score]
+            for participant in sorted(bucket):
+                if len(rows) == n:
+                    return rows
+                rows.append((ahead + 1, participant, score))
+            ahead += len(bucket)
+        return rows
+
+
+class Leaderboard:
+    """Per-system and overall rankings, updated on every score change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.systems = {system: RankIndex(SYSTEM_MAX) for system in SYSTEMS}
+        self.overall = RankIndex(OVERALL_MAX)
+
+    def record(self, participant, prog):
+        """Update rankings from a participant's ``Progress``."""
+        with self._lock:
+            for system in SYSTEMS:
+                self.systems[system].set(participant, prog.score(system))
+            self.overall.set(participant, prog.total_score)
+
+    def update(self, participant, record):
+        """Progress store listener: record a save, or remove on forget."""
+        if record is None:
+            self.remove(participant)
+        else:
+            self.record(participant, progress.Progress.decode(record))
+
+    def remove(self, participant):
+        with self._lock:
+            for index in self.systems.values():
+                index.remove(participant)
+            self.overall.remove(participant)
+
+    def standings(self, n):
+        """Top ``n`` rows for the overall and each per-system ranking."""
+        with self._lock:
+            tables = {"overall": self.overall.top(n)}
+            tables.update({s: index.top(n) for s, index in self.systems.items()})
+            return tables
+
+    def ranks(self, participant):
+        with self._lock:
+            ranks = {"overall": self.overall.rank(participant)}
+            ranks.update({s: index.rank(participant) for s, index in self.systems.items()})
+            return ranks, len(self.overall)
+
+
+@st.cache_resource(show_spinner=False)
+def get_leaderboard():
+    """The process-wide leaderboard, seeded once from the progress store."""
+    board = Leaderboard()
+    progress_store = store.get_store()
+    # Subscribe before seeding so no save falls between the two; record()
+    # is idempotent, so seeing a participant twice is harmless.
+    progress_store.subscribe(board.update)
+    for participant, record in progress_store.items():
+        board.update(participant, record)
+    return board
+
+
+@st.cache_data(ttl=READ_TTL, show_spinner=False)
+def standings(n=20):
+    return get_leaderboard().standings(n)
+
+
+@st.cache_data(ttl=READ_TTL, show_spinner=False)
+def ranks(participant):
+    return get_leaderboard().ranks(participant)
@@ -0,0 +1,238 @@
+"""Low-overhead per-rerun instrumentation.
+
+Pages time named sections (header, content, diagram, each stage, completion)
+with ``metrics.section(page, name)`` and count reruns with
+``metrics.rerun(page)``. Observations go into fixed-bucket histograms held in
+process memory (one lock, about 4 us per timed section) and are
+exported two ways:
+
+* Prometheus text format on ``http://127.0.0.1:$ECOENGINEER_METRICS_PORT/metrics``
+  (default 9464, ``0`` disables the endpoint);
+* a size-rotated JSONL log at ``$ECOENGINEER_METRICS_LOG``, one snapshot every
+  ``$ECOENGINEER_METRICS_INTERVAL`` seconds.
+"""
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from ecoengineer import sessions
+
+METRICS_PORT = int(os.environ.get("ECOENGINEER_METRICS_PORT", "9464"))
+METRICS_LOG = Path(
+    os.environ.get(
+        "ECOENGINEER_METRICS_LOG",
+        Path(__file__).resolve().parent.parent / ".cache" / "metrics.jsonl",
+    )
+)
+LOG_INTERVAL = float(os.environ.get("ECOENGINEER_METRICS_INTERVAL", "10"))
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 3
+# Session ids remembered for the distinct-session count, most recent kept. A
+# session idle while this many others reran is counted again when it returns.
+SEEN_SESSIONS = 10_000
+
+# Histogram bucket upper bounds, in seconds.
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Histogram:
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+class Registry:
+    """All counters and histograms for this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sections = {}  # (page, section) -> Histogram
+        self.reruns = {}  # (page, kind) -> int
+        self.sessions = {}  # session id -> reruns since the last log interval
+        self.sessions_seen = 0
+        self._seen = OrderedDict()  # recently seen session ids, oldest first
+
+    def observe(self, page, section, seconds):
+        with self._lock:
+            hist = self.sections.get((page, section))
+            if hist is None:
+                hist = self.sections[(page, section)] = Histogram()
+            hist.observe(seconds)
+
+    def count_rerun(self, page, kind, session_id):
+        with self._lock:
+            key = (page, kind)
+            self.reruns[key] = self.reruns.get(key, 0) + 1
+            if session_id is not None:
+                self.sessions[session_id] = self.sessions.get(session_id, 0) + 1
+                if session_id in self._seen:
+                    self._seen.move_to_end(session_id)
+                else:
+                    self._seen[session_id] = None
+                    self.sessions_seen += 1
+                    if len(self._seen) > SEEN_SESSIONS:
+                        self._seen.popitem(last=False)
+
+    # --- Export ---
+    def prometheus(self):
+        """Render everything in the Prometheus text exposition format."""
+        with self._lock:
+            sections = {k: (list(h.counts), h.total, h.count) for k, h in self.sections.items()}
+            reruns = dict(self.reruns)
+            seen, active = self.sessions_seen, len(self.sessions)
+        lines = [
+            "# HELP ecoengineer_section_seconds Time spent in a named page section.",
+            "# TYPE ecoengineer_section_seconds histogram",
+        ]
+        for (page, section), (counts, total, count) in sorted(sections.items()):
+            labels = f'page="{page}",section="{section}"'
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                lines.append(f'ecoengineer_section_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'ecoengineer_section_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"ecoengineer_section_seconds_sum{{{labels}}} {total:.6f}")
+            lines.append(f"ecoengineer_section_seconds_count{{{labels}}} {count}")
+        lines += [
+            "# HELP ecoengineer_reruns_total Script reruns by page and kind (full or fragment).",
+            "# TYPE ecoengineer_reruns_total counter",
+        ]
+        for (page, kind), n in sorted(reruns.items()):
+            lines.append(f'ecoengineer_reruns_total{{page="{page}",kind="{kind}"}} {n}')
+        lines += [
+            "# HELP ecoengineer_sessions_seen_total Distinct sessions that have rerun a page.",
+            "# TYPE ecoengineer_sessions_seen_total counter",
+            f"ecoengineer_sessions_seen_total {seen}",
+            "# HELP ecoengineer_sessions_active Sessions that reran a page in the current log interval.",
+            "# TYPE ecoengineer_sessions_active gauge",
+            f"ecoengineer_sessions_active {active}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def drain(self):
+        """Return a JSONL snapshot: cumulative totals plus per-session reruns
+        since the previous snapshot (which are then reset)."""
+        with self._lock:
+            sessions, self.sessions = self.sessions, {}
+            sections = {
+                f"{page}/{section}": {"count": h.count, "sum_s": round(h.total, 6)}
+                for (page, section), h in self.sections.items()
+            }
+            reruns = {f"{page}/{kind}": n for (page, kind), n in self.reruns.items()}
+        return {"ts": time.time(), "reruns": reruns, "sections": sections, "session_reruns": sessions}
+
+
+REGISTRY = Registry()
+
+
+# --- Instrumentation API ---
+def _session_id():
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def rerun(page, kind="full"):
+    """Count one rerun of ``page`` for the current session.
+
+    Every page and fragment passes through here, so this is also where the
+    session is marked active (and restored if it was evicted).
+    """
+    _ensure_exporters()
+    sessions.touch()
+    REGISTRY.count_rerun(page, kind, _session_id())
+
+
+def fragment_rerun(page):
+    """Count a fragment-only rerun; no-op when the fragment runs with its page."""
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx and ctx.fragment_ids_this_run:
+        rerun(page, "fragment")
+
+
+@contextmanager
+def section(page, name):
+    """Time the enclosed block as ``page``/``name``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.observe(page, name, time.perf_counter() - start)
+
+
+# --- Exporters ---
+def _serve():
+    # http.server is imported here so page imports do not pay for it.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = REGISTRY.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", METRICS_PORT), Handler)
+    except OSError as e:
+        _LOGGER.warning("Metrics endpoint disabled: cannot bind port %s (%s)", METRICS_PORT, e)
+        return
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+
+
+def _log_loop():
+    METRICS_LOG.parent.mkdir(parents=True, exist_ok=True)
+    handler = RotatingFileHandler(METRICS_LOG, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    log = logging.getLogger("ecoengineer.metrics.jsonl")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    log.addHandler(handler)
+    while True:
+        time.sleep(LOG_INTERVAL)
+        snapshot = REGISTRY.drain()
+        snapshot["pid"] = os.getpid()
+        log.info(json.dumps(snapshot, separators=(",", ":")))
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def _ensure_exporters():
+    global _started
+    if _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+        if METRICS_PORT:
+            _serve()
+        threading.Thread(target=_log_loop, name="metrics-log", daemon=True).start()
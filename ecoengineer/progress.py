@@ -0,0 +1,163 @@
+"""Compact per-session quiz progress.
+
+One ``Progress`` object per session replaces the loose ``<system>_stage``,
+``_score``, ``_completed``, ``_hint`` keys and the ``completed_systems`` and
+``achievements`` lists. Stages are 4-bit nibbles, scores one byte each and
+completion and achievements 4-bit masks, all packed into a single 64-bit word
+that serializes to ``Progress.SIZE`` (9) bytes for persistence and the signed
+resume token (``ecoengineer/resume.py``).
+"""
+import json
+import struct
+
+import streamlit as st
+
+from ecoengineer import SYSTEMS, sessions
+
+INDEX = {name: i for i, name in enumerate(SYSTEMS)}
+VERSION = 1
+
+# Bit layout of the packed 64-bit word, four systems:
+#   [0, 16)   stage nibble per system
+#   [16, 48)  score byte per system
+#   [48, 52)  completed bitmask
+#   [52, 56)  achievement bitmask
+SCORE_SHIFT = 16
+COMPLETED_SHIFT = 48
+ACHIEVEMENT_SHIFT = 52
+INITIAL = 0x1111  # every system on stage 1
+
+
+class Progress:
+    """Stage, score, completion and achievement for every system."""
+
+    __slots__ = ("word", "hints", "celebrate")
+
+    _FORMAT = struct.Struct("<BQ")
+    SIZE = _FORMAT.size
+
+    def __init__(self, word=INITIAL):
+        self.word = word
+        # Transient UI state, not serialized. Hints stay None until needed.
+        self.hints = None
+        self.celebrate = None
+
+    def _get(self, shift, width):
+        return (self.word >> shift) & ((1 << width) - 1)
+
+    def _set(self, shift, width, value):
+        mask = ((1 << width) - 1) << shift
+        self.word = (self.word & ~mask) | ((value << shift) & mask)
+
+    # --- Accessors ---
+    def stage(self, system):
+        return self._get(4 * INDEX[system], 4)
+
+    def set_stage(self, system, n):
+        self._set(4 * INDEX[system], 4, n)
+
+    def score(self, system):
+        return self._get(SCORE_SHIFT + 8 * INDEX[system], 8)
+
+    def add_score(self, system, points):
+        shift = SCORE_SHIFT + 8 * INDEX[system]
+        self._set(shift, 8, min(255, self._get(shift, 8) + points))
+
+    def is_completed(self, system):
+        return bool(self.word >> (COMPLETED_SHIFT + INDEX[system]) & 1)
+
+    def complete(self, system):
+        """Mark ``system`` completed and award its achievement (idempotent)."""
+        i = INDEX[system]
+        self.word |= (1 << (COMPLETED_SHIFT + i)) | (1 << (ACHIEVEMENT_SHIFT + i))
+
+    def has_achievement(self, system):
+        return bool(self.word >> (ACHIEVEMENT_SHIFT + INDEX[system]) & 1)
+
+    def hint(self, system):
+        return self.hints[INDEX[system]] if self.hints else ""
+
+    def set_hint(self, system, text):
+        if self.hints is None:
+            if not text:
+                return
+            self.hints = [""] * len(SYSTEMS)
+        self.hints[INDEX[system]] = text
+
+    def merge(self, other):
+        """Advance to ``other`` wherever it is further along; return self.
+
+        Stages and scores only grow and completion is never undone, so taking
+        the larger stage and score per system and the union of the masks makes
+        an older record (a stale token, a lagging store row) harmless.
+        """
+        for system in SYSTEMS:
+            i = INDEX[system]
+            self._set(4 * i, 4, max(self.stage(system), other.stage(system)))
+            shift = SCORE_SHIFT + 8 * i
+            self._set(shift, 8, max(self._get(shift, 8), other._get(shift, 8)))
+        self.word |= other.word & (((1 << 8) - 1) << COMPLETED_SHIFT)
+        return self
+
+    @property
+    def total_score(self):
+        return sum(self._get(SCORE_SHIFT, 32).to_bytes(4, "little"))
+
+    @property
+    def completed_count(self):
+        return bin(self._get(COMPLETED_SHIFT, 4)).count("1")
+
+    # --- Serialization ---
+    def to_bytes(self):
+        return self._FORMAT.pack(VERSION, self.word)
+
+    @classmethod
+    def from_bytes(cls, data):
+        version, word = cls._FORMAT.unpack(data)
+        if version != VERSION:
+            raise ValueError(f"Unsupported progress record version {version}")
+        return cls(word & ((1 << 56) - 1))
+
+    @classmethod
+    def decode(cls, value):
+        """Decode a stored record; also accepts the older JSON key/value rows."""
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return cls.from_bytes(bytes(value))
+        legacy = json.loads(value)
+        progress = cls()
+        for system in SYSTEMS:
+            progress.set_stage(system, legacy.get(f"{system}_stage", 1))
+            progress.add_score(system, legacy.get(f"{system}_score", 0))
+            if legacy.get(f"{system}_completed"):
+                progress.complete(system)
+        return progress
+
+    def __repr__(self):
+        fields = ", ".join(
+            f"{s}={self.stage(s)}/{self.score(s)}{'*' if self.is_completed(s) else ''}"
+            for s in SYSTEMS
+        )
+        return f"Progress({fields})"
+
+
+def get():
+    """The current session's ``Progress``, created on first use.
+
+    A session that was evicted comes back from its snapshot (which
+    ``sessions.touch()`` restored at the start of the run), and a valid resume
+    token in the URL is merged in; an old token never takes progress back.
+    When the session is bound to a participant, their stored record is merged
+    in too, so a stale tab or bookmark does not overwrite newer progress on
+    the next save.
+    """
+    state = st.session_state
+    if "progress" not in state:
+        from ecoengineer import resume, store  # both import this module
+
+        saved = state.pop(sessions.RESTORED_KEY, None)
+        prog = Progress.from_bytes(saved) if saved is not None else Progress()
+        for record in (resume.restore(), store.stored(state.get("participant"))):
+            if record is not None:
+                prog.merge(record)
+        state.progress = prog
+    return state.progress
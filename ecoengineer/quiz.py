@@ -0,0 +1,217 @@
+"""Data-driven quiz engine shared by the system pages.
+
+Stage definitions live in ``stages.json``. They are parsed once per process
+into an immutable stage table (``st.cache_resource``); every rerun then does a
+single lookup and renders only the current stage, inside an ``st.fragment`` so
+that answering a question does not rerun the rest of the page. Numeric stages
+with a template in ``variants`` show this session's variant from a pool built
+alongside the table.
+
+Each stage's inputs sit in an ``st.form`` so that picking answers does not
+rerun anything; the stage costs one rerun, on Check/Submit. Set
+``ECOENGINEER_FORM_INPUT=0`` to go back to live widgets.
+"""
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+
+import streamlit as st
+
+from ecoengineer import metrics, progress, resume, store, variants
+
+STAGES_PATH = Path(__file__).with_name("stages.json")
+KINDS = ("arrange", "choice", "numeric")
+FORM_INPUT = os.environ.get("ECOENGINEER_FORM_INPUT", "1") != "0"
+
+
+@dataclass(frozen=True)
+class Stage:
+    kind: str
+    heading: str
+    points: int
+    key: str
+    button: str
+    button_key: str
+    success: str
+    error: str
+    hint: str
+    prompt: str = ""
+    options: tuple = ()
+    answer: object = None
+    tolerance: float = 0
+    label: str = ""
+    bounds: tuple = ()
+
+    def grade(self, value):
+        """Return True when ``value`` answers this stage correctly."""
+        if self.kind == "numeric":
+            return abs(value - self.answer) < self.tolerance
+        return value == self.answer
+
+
+@dataclass(frozen=True)
+class System:
+    name: str
+    title: str
+    achievement: str
+    stages: tuple
+    # banners[i] is the "✅ Stage N Complete" block shown above stage i + 1;
+    # banners[-1] covers a fully completed system.
+    banners: tuple
+    max_score: int
+
+
+def _build_stage(n, raw):
+    if raw["kind"] not in KINDS:
+        raise ValueError(f"Unknown stage kind {raw['kind']!r}")
+    points = raw["points"]
+    unit = "pt" if points == 1 else "pts"
+    answer = raw["answer"]
+    return Stage(
+        kind=raw["kind"],
+        heading=f"### Stage {n}: {raw['title']} ({points} {unit})",
+        points=points,
+        key=raw["key"],
+        button=raw["button"],
+        button_key=raw["button_key"],
+        success=raw["success"],
+        error=raw["error"],
+        hint=raw["hint"],
+        prompt=raw.get("prompt", ""),
+        options=tuple(raw.get("options", ())),
+        answer=tuple(answer) if isinstance(answer, list) else answer,
+        tolerance=raw.get("tolerance", 0),
+        label=raw.get("label", ""),
+        bounds=tuple(raw.get("bounds", ())),
+    )
+
+
+def parse_stage_table(data):
+    """Build the immutable ``{system: System}`` table from decoded JSON."""
+    table = {}
+    for name, raw in data.items():
+        stages = tuple(_build_stage(n, s) for n, s in enumerate(raw["stages"], 1))
+        done = [f"✅ Stage {n} Complete" for n in range(1, len(stages) + 1)]
+        banners = tuple("  \n".join(done[:i]) for i in range(len(stages) + 1))
+        table[name] = System(
+            name=name,
+            title=raw["title"],
+            achievement=raw["achievement"],
+            stages=stages,
+            banners=banners,
+            max_score=sum(s.points for s in stages),
+        )
+    return MappingProxyType(table)
+
+
+@st.cache_resource
+def load_stage_table(path=STAGES_PATH):
+    """Load and freeze the stage table once per process."""
+    with open(path, encoding="utf-8") as f:
+        return parse_stage_table(json.load(f))
+
+
+@st.cache_resource
+def load_pools():
+    """Every numeric-stage variant pool, loaded once per process."""
+    return variants.load_pools(load_stage_table(), (STAGES_PATH, __file__))
+
+
+# --- Rendering ---
+def _read_answer(stage):
+    if stage.kind == "arrange":
+        cols = st.columns(len(stage.answer))
+        return tuple(
+            c.selectbox(f"{i + 1}", stage.options, key=f"{stage.key}_{i}")
+            for i, c in enumerate(cols)
+        )
+    st.write(stage.prompt)
+    if stage.kind == "choice":
+        return st.radio(
+            stage.prompt, stage.options, key=stage.key, label_visibility="collapsed"
+        )
+    lo, hi, step = stage.bounds
+    return st.number_input(stage.label, lo, hi, step=step, key=stage.key)
+
+
+def form_key(stage):
+    return f"{stage.button_key}_form"
+
+
+def render_stage(system, n):
+    """Render stage ``n`` of ``system``; return True if it was just passed."""
+    prog = progress.get()
+    name = system.name
+    variant, stage = variants.pick(load_pools(), variants.session_seed(), system.stages[n - 1])
+    passed = False
+    with metrics.section(name, f"stage{n}"), st.container():
+        st.markdown(stage.heading)
+        if FORM_INPUT:
+            with st.form(form_key(stage), border=False):
+                value = _read_answer(stage)
+                # Submit buttons take no key; the form key identifies them.
+                submitted = st.form_submit_button(stage.button)
+        else:
+            value = _read_answer(stage)
+            submitted = st.button(stage.button, key=stage.button_key)
+        if submitted:
+            correct = stage.grade(value)
+            # Imported here: the attempt log is only needed once an answer is in.
+            from ecoengineer import attempts
+
+            attempts.record(name, n, value, correct, variant)
+            if correct:
+                st.success(stage.success)
+                prog.add_score(name, stage.points)
+                prog.set_hint(name, "")
+                if n == len(system.stages):
+                    prog.complete(name)
+                else:
+                    prog.set_stage(name, n + 1)
+                store.save_session()
+                passed = True
+            else:
+                st.error(stage.error)
+                prog.set_hint(name, stage.hint)
+        if prog.hint(name):
+            st.warning(prog.hint(name))
+    return passed
+
+
+@st.fragment
+def _quiz_fragment(name):
+    """Current stage as a fragment: Submit/Check reruns only this block."""
+    metrics.fragment_rerun(name)
+    system = load_stage_table()[name]
+    prog = progress.get()
+    n = prog.stage(name)
+    if system.banners[n - 1]:
+        st.markdown(system.banners[n - 1])
+    if render_stage(system, n):
+        if prog.is_completed(name):
+            # Completion changes elements outside the fragment (result banner,
+            # app-level totals), so this is the one transition that needs a
+            # full page rerun.
+            prog.celebrate = name
+            st.rerun()
+        render_stage(system, n + 1)
+
+
+def run(name):
+    """Render the quiz for one system: progress banner, current stage, result."""
+    system = load_stage_table()[name]
+    prog = progress.get()
+    resume.sync(prog)
+
+    if not prog.is_completed(name):
+        _quiz_fragment(name)
+        return
+
+    with metrics.section(name, "completion"):
+        st.markdown(system.banners[-1])
+        st.success(f"🎉 Completed! Score: {prog.score(name)}/{system.max_score}")
+        if prog.celebrate == name:
+            prog.celebrate = None
+            st.balloons()
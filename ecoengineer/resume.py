@@ -0,0 +1,125 @@
+"""Signed resume tokens carried in the page URL.
+
+The session's packed ``Progress`` record (9 bytes) plus a truncated
+HMAC-SHA256 tag is base64url-encoded into the ``?p=`` query parameter and kept
+up to date as the participant progresses. A reconnect, a reload or a second
+tab restores progress from the URL alone, so any server process can serve any
+participant without sticky sessions or a database read. The Participant ID, if
+set, rides along in ``?id=`` so that the restored session keeps saving to the
+shared progress store. It is covered by the token's tag: a token only restores
+for the ID it was issued with, so swapping ``?id=`` invalidates it.
+
+Tokens carry no sequence number. A restored token is merged into whatever the
+session already has (``Progress.merge``), so replaying an old link cannot
+lower a score.
+
+The signing key comes from ``$ECOENGINEER_RESUME_SECRET``; without it a random
+key is generated once and kept in ``.cache/resume.key``, which is enough for
+processes sharing one host. Set the variable on every host of a multi-host
+deployment.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+import secrets
+from pathlib import Path
+
+import streamlit as st
+
+from ecoengineer.progress import Progress
+
+PARAM = "p"
+PARTICIPANT_PARAM = "id"
+TAG_SIZE = 12  # 96-bit tag; the token is 28 characters
+KEY_PATH = Path(__file__).resolve().parent.parent / ".cache" / "resume.key"
+
+_mac = None
+
+
+def _load_key():
+    secret = os.environ.get("ECOENGINEER_RESUME_SECRET")
+    if secret:
+        return secret.encode("utf-8")
+    try:
+        return KEY_PATH.read_bytes()
+    except FileNotFoundError:
+        pass
+    KEY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = KEY_PATH.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(secrets.token_bytes(32))
+    try:
+        # Link rather than rename so that two processes racing here agree on
+        # whichever key was written first.
+        os.link(tmp, KEY_PATH)
+    except FileExistsError:
+        pass
+    finally:
+        tmp.unlink()
+    return KEY_PATH.read_bytes()
+
+
+def _sign(payload):
+    global _mac
+    if _mac is None:
+        _mac = hmac.new(_load_key(), digestmod=hashlib.sha256)
+    mac = _mac.copy()
+    mac.update(payload)
+    return mac.digest()[:TAG_SIZE]
+
+
+def encode(prog, participant=""):
+    """Return the signed URL token for ``prog``, bound to ``participant``."""
+    payload = prog.to_bytes()
+    tag = _sign(payload + participant.encode("utf-8"))
+    return base64.urlsafe_b64encode(payload + tag).decode("ascii")
+
+
+def decode(token, participant=""):
+    """Return the ``Progress`` in ``token``, or None if it is malformed, forged
+    or was issued for another participant."""
+    try:
+        raw = base64.urlsafe_b64decode(token)
+    except (binascii.Error, ValueError):
+        return None
+    if len(raw) != Progress.SIZE + TAG_SIZE:
+        return None
+    payload, tag = raw[: Progress.SIZE], raw[Progress.SIZE:]
+    if not hmac.compare_digest(tag, _sign(payload + participant.encode("utf-8"))):
+        return None
+    try:
+        return Progress.from_bytes(payload)
+    except ValueError:
+        return None
+
+
+def restore():
+    """Progress from this page's ``?p=`` token, if it carries a valid one for
+    the session's participant.
+
+    Also rebinds the session to the URL's Participant ID, if it has none.
+    """
+    params = st.query_params
+    participant = params.get(PARTICIPANT_PARAM)
+    if participant and "participant" not in st.session_state:
+        st.session_state.participant = participant
+    token = params.get(PARAM)
+    return decode(token, st.session_state.get("participant", "")) if token else None
+
+
+def sync(prog):
+    """Point the URL at ``prog`` so that reloading resumes from here."""
+    params = st.query_params
+    participant = st.session_state.get("participant")
+    token = encode(prog, participant or "")
+    if params.get(PARAM) != token:
+        params[PARAM] = token
+    if participant and params.get(PARTICIPANT_PARAM) != participant:
+        params[PARTICIPANT_PARAM] = participant
+    elif not participant and PARTICIPANT_PARAM in params:
+        del params[PARTICIPANT_PARAM]
+
+
+def clear():
+    st.query_params.clear()
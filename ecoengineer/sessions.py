@@ -0,0 +1,218 @@
+"""Idle-session eviction with on-disk snapshots.
+
+Every page run and every fragment rerun touches the current session in a
+process-wide LRU registry (``touch()`` is called from ``metrics.rerun`` and
+``metrics.fragment_rerun``, which each page and fragment already calls).
+A sweeper thread evicts sessions that have been idle for
+``$ECOENGINEER_IDLE_SECONDS`` (default 600), and also the least recently used
+ones while more than ``$ECOENGINEER_MAX_SESSIONS`` (default 500) are resident,
+as long as they have been idle for at least ``MIN_IDLE`` seconds, so a session
+is never evicted in the middle of a script run. The cap is therefore a soft
+limit: when more than ``MAX_SESSIONS`` sessions were all active within the
+last ``MIN_IDLE`` seconds, they all stay resident until they go quiet.
+
+Eviction writes the compact part of the session (packed progress, Participant
+ID, question seed) to ``$ECOENGINEER_SESSION_DIR/<session id>.json`` and
+clears the rest of its ``st.session_state``, widget state included. On the next
+interaction the browser resends its widget values as usual and ``touch()``
+puts the kept keys back, leaving the packed progress under ``RESTORED_KEY``
+for ``progress.get()``, so the participant notices nothing.
+"""
+import base64
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from pathlib import Path
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+SESSION_DIR = Path(
+    os.environ.get(
+        "ECOENGINEER_SESSION_DIR",
+        Path(__file__).resolve().parent.parent / ".cache" / "sessions",
+    )
+)
+IDLE_SECONDS = float(os.environ.get("ECOENGINEER_IDLE_SECONDS", "600"))
+MAX_SESSIONS = int(os.environ.get("ECOENGINEER_MAX_SESSIONS", "500"))  # soft, see above
+MIN_IDLE = 30  # seconds; LRU eviction never takes a session busier than this
+SNAPSHOT_TTL = 24 * 3600  # snapshots of sessions that never came back
+
+# Session keys worth keeping; everything else is rebuilt or resent by the browser.
+KEPT_KEYS = ("participant", "question_seed")
+RESTORED_KEY = "restored_progress"  # packed Progress from a snapshot, until progress.get() takes it
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SessionManager:
+    """LRU registry of resident sessions plus the snapshot directory."""
+
+    def __init__(self, directory=SESSION_DIR, idle_seconds=IDLE_SECONDS,
+                 max_sessions=MAX_SESSIONS, min_idle=MIN_IDLE):
+        self.directory = Path(directory)
+        self.idle_seconds = idle_seconds
+        self.max_sessions = max_sessions
+        self.min_idle = min_idle
+        self.evicted = 0
+        self.restored = 0
+        self.supported = True  # False once eviction found Streamlit's internals missing
+        self._evicted = set()  # session ids with a snapshot to restore
+        # session id -> [weakref to the session's SafeSessionState, last seen]
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def touch(self, session_id, session_state):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                self._sessions[session_id] = [weakref.ref(session_state), now]
+            else:
+                entry[1] = now
+                self._sessions.move_to_end(session_id)
+
+    def sweep(self):
+        """Evict idle and over-cap sessions; return how many were evicted."""
+        now = time.monotonic()
+        victims = []
+        with self._lock:
+            for sid in [sid for sid, (ref, _) in self._sessions.items() if ref() is None]:
+                del self._sessions[sid]  # closed by Streamlit
+            excess = len(self._sessions) - self.max_sessions
+            # Oldest first: stop at the first session that may stay.
+            for sid, (ref, seen) in list(self._sessions.items()):
+                idle = now - seen
+                if idle < self.idle_seconds and (excess <= 0 or idle < self.min_idle):
+                    break
+                del self._sessions[sid]
+                victims.append((sid, ref()))
+                excess -= 1
+        evicted = [sid for sid, state in victims if state is not None and self._evict(sid, state)]
+        with self._lock:
+            self._evicted.update(evicted)
+        self.evicted += len(evicted)
+        return len(evicted)
+
+    def restore(self, session_id):
+        """Return and delete the snapshot for ``session_id``, or None.
+
+        Only sessions this manager evicted are looked up, so calling it on
+        every rerun costs a set lookup.
+        """
+        with self._lock:
+            if session_id not in self._evicted:
+                return None
+            self._evicted.discard(session_id)
+        path = self._path(session_id)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        path.unlink(missing_ok=True)
+        self.restored += 1
+        return data
+
+    def purge(self, max_age=SNAPSHOT_TTL):
+        """Delete snapshots older than ``max_age`` seconds."""
+        cutoff = time.time() - max_age
+        kept = set()
+        for path in self.directory.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                else:
+                    kept.add(path.stem)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._evicted &= kept
+
+    def _path(self, session_id):
+        return self.directory / f"{session_id}.json"
+
+    def _evict(self, session_id, safe_state):
+        # Streamlit has no public way to reach another session's state from a
+        # background thread: the public SafeSessionState methods call back
+        # into the script runner, which must not happen from this thread. So
+        # take the wrapper's lock and use the public SessionState mapping API
+        # on the wrapped state. Both attributes are private to Streamlit,
+        # which is why requirements-basic.txt pins streamlit==1.38.0; should a
+        # later release drop them, sessions are simply no longer evicted.
+        # __dict__, not getattr: a missing attribute would fall through to
+        # SafeSessionState.__getattr__, i.e. into the script runner.
+        attrs = getattr(safe_state, "__dict__", {})
+        lock, state = attrs.get("_lock"), attrs.get("_state")
+        if lock is None or state is None:
+            if self.supported:
+                _LOGGER.warning("This Streamlit version does not support session eviction")
+                self.supported = False
+            return False
+        with lock:
+            snapshot = {key: state[key] for key in KEPT_KEYS if key in state}
+            if "progress" in state:
+                snapshot["progress"] = base64.b64encode(state["progress"].to_bytes()).decode("ascii")
+            if snapshot:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                path = self._path(session_id)
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_text(json.dumps(snapshot, separators=(",", ":")), encoding="utf-8")
+                tmp.replace(path)
+            state.clear()
+        return True
+
+    def run(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.sweep()
+                self.purge()
+            except Exception:
+                _LOGGER.exception("Session sweep failed")
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_manager():
+    """The process-wide manager; starts its sweeper thread on first use."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                manager = SessionManager()
+                interval = max(1.0, min(60.0, manager.idle_seconds / 4))
+                threading.Thread(
+                    target=manager.run, args=(interval,), name="session-sweeper", daemon=True
+                ).start()
+                _manager = manager
+    return _manager
+
+
+def touch():
+    """Mark the current session as active and restore it if it was evicted.
+
+    Puts the kept keys back into ``st.session_state`` and the packed progress
+    record under ``RESTORED_KEY``.
+    """
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return
+    manager = get_manager()
+    manager.touch(ctx.session_id, ctx.session_state)
+    snapshot = manager.restore(ctx.session_id)
+    if snapshot is None:
+        return
+    for key in KEPT_KEYS:
+        if key in snapshot and key not in ctx.session_state:
+            ctx.session_state[key] = snapshot[key]
+    record = snapshot.get("progress")
+    if record:
+        ctx.session_state[RESTORED_KEY] = base64.b64decode(record)
@@ -0,0 +1,19 @@
+"""Interactive engineering simulators shown on the system pages.
+
+Each module holds a vectorized NumPy model, a bounded ``st.cache_resource``
+memo keyed by quantized inputs (so nearby slider positions from many sessions
+share one entry) and a ``panel()`` fragment that renders the controls and
+results. Pages import these modules only when the simulator is opened, which
+keeps NumPy off the page-import path.
+"""
+
+
+def quantize(value, step):
+    """Round ``value`` to the nearest multiple of ``step``."""
+    return round(round(value / step) * step, 10)
+
+
+def frozen(array):
+    """Mark a cached array read-only; cached results are shared across sessions."""
+    array.flags.writeable = False
+    return array
@@ -0,0 +1,253 @@
+"""Energy and moisture balance of a biomass steam CHP plant.
+
+Per kilogram of fuel as received, with moisture fraction ``M`` and dry-basis
+higher heating value ``HHV`` and hydrogen content ``H``:
+
+    LHV = HHV (1 - M) - L (M + 8.936 H (1 - M))        L = 2.443 MJ/kg
+
+The latent heat of all the water (fuel moisture plus water formed from the
+hydrogen) leaves with the flue gas. The boiler also loses the sensible heat of
+the dry flue gas and that vapour, plus fixed radiation and unburnt-carbon
+losses. The steam drives a turbine whose electrical efficiency drops when it
+runs back-pressure to deliver district heat.
+
+Every function broadcasts over its arguments, so a heatmap of thousands of
+(moisture, parameter) combinations is a single pass over 2-D arrays.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import streamlit as st
+
+from ecoengineer import metrics
+from ecoengineer.sim import frozen, quantize
+
+LATENT = 2.443  # MJ/kg water at 25 °C
+WATER_PER_H = 8.936  # kg water formed per kg hydrogen
+AIR_STOICH = 6.0  # kg air per kg dry biomass
+CP_GAS = 1.05e-3  # MJ/(kg K), dry flue gas
+CP_VAPOUR = 1.9e-3  # MJ/(kg K)
+AMBIENT = 20.0  # °C
+RADIATION_LOSS = 0.015
+GENERATOR_EFFICIENCY = 0.97
+AUXILIARY = 0.08  # share of gross output used by fans, pumps and fuel handling
+BACKPRESSURE_PENALTY = 0.2  # relative loss of cycle efficiency at full heat recovery
+CACHE_ENTRIES = 256
+
+# name: (dry HHV MJ/kg, hydrogen, ash) on a dry basis
+FUELS = {
+    "Wood chips": (19.8, 0.060, 0.010),
+    "Straw": (17.6, 0.057, 0.060),
+    "Miscanthus": (18.5, 0.058, 0.030),
+    "Bagasse": (19.0, 0.058, 0.035),
+}
+
+# Plant field: (label, low, high, display scale)
+HEATMAP_AXES = {
+    "flue_temp": ("Flue gas temperature (°C)", 100.0, 250.0, 1),
+    "excess_air": ("Excess air (%)", 0.1, 1.0, 100),
+    "cycle_efficiency": ("Steam cycle efficiency (%)", 0.18, 0.38, 100),
+    "heat_recovery": ("Heat recovery (%)", 0.0, 0.95, 100),
+}
+# balance() output: (label, display scale)
+HEATMAP_OUTPUTS = {
+    "electrical_eff": ("Net electrical efficiency (%)", 100),
+    "chp_eff": ("Overall CHP efficiency (%)", 100),
+    "mwh_per_dry_t": ("Electricity per dry tonne (MWh)", 1),
+}
+DEFAULT_MIX = {"Wood chips": 70, "Straw": 30}
+MOISTURE = np.linspace(0.0, 0.6, 61)
+HEATMAP_ROWS = 50
+
+
+@dataclass(frozen=True)
+class Plant:
+    moisture: float = 0.35  # fraction, as received
+    feed_t_h: float = 10.0  # t/h, as received
+    excess_air: float = 0.4
+    flue_temp: float = 160.0  # °C at the stack
+    cycle_efficiency: float = 0.30  # steam to shaft, condensing
+    heat_recovery: float = 0.0  # share of the exhaust heat sold as district heat
+
+
+def blend(mix):
+    """Mass-weighted dry HHV, hydrogen and ash of ``mix`` ({fuel: share})."""
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("The fuel mix is empty")
+    props = np.array([FUELS[name] for name in mix]).T
+    weights = np.array(list(mix.values())) / total
+    return tuple(float(x) for x in props @ weights)
+
+
+def balance(fuel, moisture, excess_air, flue_temp, cycle_efficiency, heat_recovery):
+    """Per-kg energy flows; every argument except ``fuel`` may be an array.
+
+    Returns a dict of arrays, efficiencies on an as-received LHV basis.
+    """
+    hhv, hydrogen, ash = fuel
+    dry = 1 - moisture
+    water = moisture + WATER_PER_H * hydrogen * dry
+    lhv = hhv * dry - LATENT * water
+    rise = flue_temp - AMBIENT
+    flue_loss = (dry * AIR_STOICH * (1 + excess_air) * CP_GAS + water * CP_VAPOUR) * rise / lhv
+    unburnt = 0.5 * ash * hhv * dry / lhv  # carbon left in the ash
+    boiler = np.clip(1 - flue_loss - RADIATION_LOSS - unburnt, 0.0, 1.0)
+    steam = boiler * lhv
+    gross = steam * cycle_efficiency * (1 - BACKPRESSURE_PENALTY * heat_recovery) * GENERATOR_EFFICIENCY
+    net = gross * (1 - AUXILIARY)
+    heat = (steam - gross / GENERATOR_EFFICIENCY) * heat_recovery
+    return {
+        "lhv": lhv,
+        "boiler_eff": boiler,
+        "net": net,  # MJ electricity per kg as received
+        "heat": heat,  # MJ heat per kg as received
+        "electrical_eff": net / lhv,
+        "chp_eff": (net + heat) / lhv,
+        "mwh_per_dry_t": net / dry / 3.6,  # GJ per dry tonne / 3.6
+    }
+
+
+@dataclass(frozen=True)
+class Result:
+    lhv: float  # MJ/kg as received
+    boiler_eff: float
+    fuel_mw: float
+    electric_mw: float
+    heat_mw: float
+    electrical_eff: float
+    chp_eff: float
+    mwh_per_dry_t: float
+
+
+@st.cache_resource(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _result(mix, plant):
+    fuel = blend(dict(mix))
+    flows = balance(fuel, plant.moisture, plant.excess_air, plant.flue_temp,
+                    plant.cycle_efficiency, plant.heat_recovery)
+    flows = {k: float(v) for k, v in flows.items()}
+    per_s = plant.feed_t_h / 3.6  # t/h -> kg/s, so MJ/kg * kg/s = MW
+    return Result(
+        lhv=flows["lhv"],
+        boiler_eff=flows["boiler_eff"],
+        fuel_mw=flows["lhv"] * per_s,
+        electric_mw=flows["net"] * per_s,
+        heat_mw=flows["heat"] * per_s,
+        electrical_eff=flows["electrical_eff"],
+        chp_eff=flows["chp_eff"],
+        mwh_per_dry_t=flows["mwh_per_dry_t"],
+    )
+
+
+@st.cache_resource(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _heatmap(mix, fixed, axis, output):
+    _, low, high, _ = HEATMAP_AXES[axis]
+    fuel = blend(dict(mix))
+    values = np.linspace(low, high, HEATMAP_ROWS)
+    params = {"moisture": MOISTURE[None, :], **dict(fixed), axis: values[:, None]}
+    grid = balance(fuel, **params)[output]
+    return frozen(values), frozen(np.broadcast_to(grid, (HEATMAP_ROWS, len(MOISTURE))).copy())
+
+
+def _key(mix, plant):
+    mix = tuple(sorted((name, quantize(share, 1)) for name, share in mix.items() if share > 0))
+    plant = Plant(
+        moisture=quantize(plant.moisture, 0.01),
+        feed_t_h=quantize(plant.feed_t_h, 0.5),
+        excess_air=quantize(plant.excess_air, 0.05),
+        flue_temp=quantize(plant.flue_temp, 5),
+        cycle_efficiency=quantize(plant.cycle_efficiency, 0.01),
+        heat_recovery=quantize(plant.heat_recovery, 0.05),
+    )
+    return mix, plant
+
+
+def result(mix, plant):
+    """Memoized plant balance; ``mix`` maps fuel names to shares in percent."""
+    return _result(*_key(mix, plant))
+
+
+def heatmap(mix, plant, axis, output):
+    """Memoized ``(axis values, grid)``; the grid has one row per axis value
+    and one column per entry of ``MOISTURE``.
+
+    The memo is keyed only on the plant fields the grid holds fixed: moisture
+    and the ``axis`` field are swept and the feed rate does not enter it, so
+    moving those sliders reuses the cached grid.
+    """
+    mix, plant = _key(mix, plant)
+    fixed = tuple((field, getattr(plant, field)) for field in HEATMAP_AXES if field != axis)
+    return _heatmap(mix, fixed, axis, output)
+
+
+# --- Panel ---
+@st.fragment
+def panel():
+    """Fuel mix and plant controls, the energy balance and a moisture heatmap."""
+    metrics.fragment_rerun("biomass")
+    st.markdown("**Fuel mix (mass share, %)**")
+    columns = st.columns(len(FUELS))
+    mix = {
+        name: col.number_input(name, 0, 100, DEFAULT_MIX.get(name, 0), 5, key=f"bm_mix_{name}")
+        for col, name in zip(columns, FUELS)
+    }
+    if not any(mix.values()):
+        st.warning("Add at least one fuel to the mix.")
+        return
+
+    c1, c2, c3 = st.columns(3)
+    moisture = c1.slider("Moisture content (%)", 0, 60, 35, 1, key="bm_moisture")
+    feed = c2.slider("Fuel feed (t/h, as received)", 1.0, 50.0, 10.0, 0.5, key="bm_feed")
+    flue_temp = c3.slider("Flue gas temperature (°C)", 100, 250, 160, 5, key="bm_flue")
+    c4, c5, c6 = st.columns(3)
+    excess_air = c4.slider("Excess air (%)", 10, 100, 40, 5, key="bm_air")
+    cycle = c5.slider("Steam cycle efficiency (%)", 18, 38, 30, 1, key="bm_cycle")
+    recovery = c6.slider("Heat recovery (%)", 0, 95, 0, 5, key="bm_recovery",
+                         help="0 for a condensing power plant; 80–95 for CHP feeding a heat network.")
+
+    plant = Plant(moisture / 100, feed, excess_air / 100, flue_temp, cycle / 100, recovery / 100)
+    res = result(mix, plant)
+    m1, m2, m3, m4, m5 = st.columns(5)
+    m1.metric("LHV (as received)", f"{res.lhv:.1f} MJ/kg", help=f"Fuel input {res.fuel_mw:,.1f} MW")
+    m2.metric("Boiler efficiency", f"{res.boiler_eff:.1%}")
+    m3.metric("Net electricity", f"{res.electric_mw:,.1f} MW", f"{res.electrical_eff:.1%} efficient",
+              delta_color="off")
+    m4.metric("Useful heat", f"{res.heat_mw:,.1f} MW")
+    m5.metric("Overall efficiency", f"{res.chp_eff:.1%}",
+              help=f"{res.mwh_per_dry_t:.2f} MWh of electricity per dry tonne")
+
+    h1, h2 = st.columns(2)
+    axis = h1.selectbox("Heatmap axis", list(HEATMAP_AXES), format_func=lambda a: HEATMAP_AXES[a][0],
+                        key="bm_axis")
+    output = h2.selectbox("Colour", list(HEATMAP_OUTPUTS), format_func=lambda o: HEATMAP_OUTPUTS[o][0],
+                          key="bm_output")
+    values, grid = heatmap(mix, plant, axis, output)
+    y_label, low, high, y_scale = HEATMAP_AXES[axis]
+    colour, c_scale = HEATMAP_OUTPUTS[output]
+    # Cell edges, so the rects tile the plane whatever the axis spacing.
+    dx = (MOISTURE[1] - MOISTURE[0]) * 50
+    dy = (high - low) / (HEATMAP_ROWS - 1) * y_scale / 2
+    y, x = np.meshgrid(values * y_scale, MOISTURE * 100, indexing="ij")
+    st.vega_lite_chart(
+        {
+            "x": (x - dx).ravel(), "x2": (x + dx).ravel(),
+            "y": (y - dy).ravel(), "y2": (y + dy).ravel(),
+            colour: (grid * c_scale).ravel().round(2),
+        },
+        {
+            "mark": {"type": "rect"},
+            "height": 300,
+            "encoding": {
+                "x": {"field": "x", "type": "quantitative", "title": "Moisture (%)"},
+                "x2": {"field": "x2"},
+                "y": {"field": "y", "type": "quantitative", "title": y_label},
+                "y2": {"field": "y2"},
+                "color": {"field": colour, "type": "quantitative", "scale": {"scheme": "viridis"}},
+            },
+        },
+        use_container_width=True,
+    )
+    st.caption(
+        "Every kilogram of water in the fuel must be evaporated and leaves the stack as vapour, "
+        "so wet fuel delivers less heat per tonne and loses more of what it has."
+    )
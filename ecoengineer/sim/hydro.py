@@ -0,0 +1,249 @@
+"""Hourly reservoir dispatch over one year.
+
+Each hour the reservoir takes in the inflow and releases the scheduled turbine
+flow, within its dead and full storage levels: when it would overtop, the
+surplus is spilled (pumping is curtailed first), and when it would run dry,
+the release is cut back. That step is a clamp,
+
+    S[t] = clip(S[t-1] + inflow[t] + pump[t] - release[t], S_min, S_max)
+
+and clamps compose into clamps (``clip(clip(x + a, l1, h1) + b, l2, h2)`` is
+``clip(x + a + b, l, h)`` for some ``l, h``), so the whole 8760-hour mass
+balance is a prefix scan over (offset, low, high) triples: log2(8760) ≈ 14
+vectorized passes instead of a Python loop over hours. Power then follows
+from the release, the head at the current storage and a head-dependent
+turbine efficiency.
+"""
+from dataclasses import dataclass, replace
+
+import numpy as np
+import streamlit as st
+
+from ecoengineer import metrics
+from ecoengineer.sim import frozen, quantize
+
+RHO_G = 1000 * 9.81  # N/m³
+HOURS = 8760
+SECONDS = 3600.0
+HM3 = 1e6  # m³ per cubic hectometre
+INFLOW_SEED = 7
+PEAK_EFFICIENCY = 0.92
+PUMP_EFFICIENCY = 0.88
+PUMP_HOURS = slice(0, 6)  # night: pump back up
+PEAK_HOURS = slice(17, 22)  # evening peak: generate the pumped water
+CACHE_ENTRIES = 128
+
+# Relative release over the day for a peaking storage plant (mean 1).
+_PEAKING = np.array([0.6] * 7 + [1.0] * 10 + [1.6] * 5 + [0.8] * 2)
+PEAKING = _PEAKING / _PEAKING.mean()
+
+
+@dataclass(frozen=True)
+class Scenario:
+    storage_hm3: float  # live storage between dead and full level
+    head_max: float  # m, at full reservoir
+    head_min: float  # m, at dead storage
+    turbine_flow: float  # m³/s, turbine capacity
+    mean_inflow: float = 60.0  # m³/s
+    min_flow: float = 10.0  # m³/s, environmental release
+    peaking: bool = False  # follow the daily demand shape instead of the inflow
+    pumped: bool = False
+    pump_flow: float = 0.0  # m³/s while pumping
+    start_fill: float = 0.7  # fraction of live storage on 1 January
+
+
+PRESETS = {
+    "Run-of-river": Scenario(storage_hm3=0.5, head_max=24.0, head_min=22.0, turbine_flow=90.0),
+    "Storage dam": Scenario(storage_hm3=150.0, head_max=120.0, head_min=70.0, turbine_flow=120.0, peaking=True),
+}
+
+
+@dataclass(frozen=True)
+class Dispatch:
+    storage: np.ndarray  # hm³ at the end of each hour
+    inflow: np.ndarray  # m³/s
+    release: np.ndarray  # m³/s through the turbines
+    spill: np.ndarray  # m³/s
+    power: np.ndarray  # MW, net of pumping
+    energy_gwh: float  # generated
+    pumped_gwh: float  # consumed by pumping
+    capacity_factor: float
+    spill_share: float  # of the year's inflow
+    low_flow_hours: int  # hours the environmental flow could not be met
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _unit_inflow(seed=INFLOW_SEED):
+    """A year of hourly inflow with mean 1: a spring melt plus storm hydrographs."""
+    rng = np.random.default_rng(seed)
+    days = np.arange(HOURS) / 24
+    seasonal = 1 + 0.6 * np.cos(2 * np.pi * (days - 120) / 365)
+    storms = np.where(rng.random(HOURS) < 1 / 240, rng.exponential(1.5, HOURS), 0.0)
+    recession = np.exp(-np.arange(24 * 14) / 60.0)  # two-week tail
+    runoff = np.convolve(storms, recession)[:HOURS]
+    inflow = seasonal + runoff
+    return frozen(inflow / inflow.mean())
+
+
+def clamp_scan(offset, low, high, start):
+    """``S[t] = clip(S[t-1] + offset[t], low, high)`` for every t, without a loop."""
+    c = np.asarray(offset, dtype=float).copy()
+    lo = np.full_like(c, low)
+    hi = np.full_like(c, high)
+    d = 1
+    while d < len(c):
+        # Compose each step with the one d hours earlier (applied first).
+        c_new = c[:-d] + c[d:]
+        lo_new = np.clip(lo[:-d] + c[d:], lo[d:], hi[d:])
+        hi_new = np.clip(hi[:-d] + c[d:], lo[d:], hi[d:])
+        c[d:], lo[d:], hi[d:] = c_new, lo_new, hi_new
+        d *= 2
+    return np.clip(start + c, lo, hi)
+
+
+def head(scenario, storage_hm3):
+    """Gross head for a reservoir whose area grows with depth."""
+    fill = storage_hm3 / scenario.storage_hm3
+    return scenario.head_min + (scenario.head_max - scenario.head_min) * np.sqrt(fill)
+
+
+def turbine_efficiency(scenario, h):
+    """Peak efficiency at the design head (90% of full), falling off either side."""
+    design = 0.9 * scenario.head_max
+    return np.clip(PEAK_EFFICIENCY - 0.8 * np.square(h / design - 1), 0.5, PEAK_EFFICIENCY)
+
+
+def schedule(scenario, inflow):
+    """Planned turbine release and pumping, both in m³/s."""
+    if scenario.peaking:
+        release = scenario.mean_inflow * np.resize(PEAKING, HOURS)
+    else:
+        release = inflow.copy()
+    release = np.clip(release, scenario.min_flow, scenario.turbine_flow)
+    pump = np.zeros(HOURS)
+    if scenario.pumped and scenario.pump_flow > 0:
+        # The environmental flow keeps passing while the pumps run.
+        release.reshape(-1, 24)[:, PUMP_HOURS] = scenario.min_flow
+        pump.reshape(-1, 24)[:, PUMP_HOURS] = scenario.pump_flow
+        extra = scenario.pump_flow * 6 / 5  # same volume back over the evening peak
+        peak = release.reshape(-1, 24)[:, PEAK_HOURS]
+        release.reshape(-1, 24)[:, PEAK_HOURS] = np.minimum(peak + extra, scenario.turbine_flow)
+    return release, pump
+
+
+def simulate(scenario):
+    inflow = scenario.mean_inflow * _unit_inflow()
+    planned, pump = schedule(scenario, inflow)
+    capacity = scenario.storage_hm3 * HM3
+    offset = (inflow + pump - planned) * SECONDS
+    storage = clamp_scan(offset, 0.0, capacity, scenario.start_fill * capacity)
+
+    before = np.concatenate(([scenario.start_fill * capacity], storage[:-1]))
+    unclamped = before + offset
+    excess = np.maximum(unclamped - capacity, 0.0) / SECONDS
+    shortfall = np.maximum(-unclamped, 0.0) / SECONDS
+    curtailed = np.minimum(excess, pump)  # stop pumping before spilling
+    pump = pump - curtailed
+    spill = excess - curtailed
+    release = planned - shortfall
+
+    h = head(scenario, storage / HM3)
+    generated = RHO_G * h * release * turbine_efficiency(scenario, h) / 1e6
+    consumed = RHO_G * h * pump / PUMP_EFFICIENCY / 1e6
+    energy = generated.sum() / 1000
+    rated_mw = RHO_G * scenario.head_max * scenario.turbine_flow * PEAK_EFFICIENCY / 1e6
+    return Dispatch(
+        storage=frozen(storage / HM3),
+        inflow=frozen(inflow),
+        release=frozen(release),
+        spill=frozen(spill),
+        power=frozen(generated - consumed),
+        energy_gwh=float(energy),
+        pumped_gwh=float(consumed.sum() / 1000),
+        capacity_factor=float(energy * 1000 / (rated_mw * HOURS)),
+        spill_share=float(spill.sum() / inflow.sum()),
+        low_flow_hours=int(np.count_nonzero(release + spill < scenario.min_flow - 1e-9)),
+    )
+
+
+@st.cache_resource(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _dispatch(scenario):
+    return simulate(scenario)
+
+
+def dispatch(scenario):
+    """Memoized year of dispatch; inputs are quantized so nearby settings share results."""
+    return _dispatch(replace(
+        scenario,
+        storage_hm3=quantize(scenario.storage_hm3, 0.5),
+        head_max=quantize(scenario.head_max, 1),
+        head_min=min(quantize(scenario.head_min, 1), quantize(scenario.head_max, 1)),
+        turbine_flow=quantize(scenario.turbine_flow, 5),
+        mean_inflow=quantize(scenario.mean_inflow, 5),
+        min_flow=quantize(scenario.min_flow, 1),
+        pump_flow=quantize(scenario.pump_flow, 5) if scenario.pumped else 0.0,
+        start_fill=quantize(scenario.start_fill, 0.05),
+    ))
+
+
+def daily(values):
+    return np.asarray(values).reshape(-1, 24).mean(axis=1)
+
+
+# --- Panel ---
+@st.fragment
+def panel():
+    """Scenario controls, annual results and daily storage/power charts."""
+    metrics.fragment_rerun("hydro")
+    name = st.radio("Scenario", list(PRESETS), horizontal=True, key="hy_preset")
+    preset = PRESETS[name]
+    c1, c2, c3 = st.columns(3)
+    mean_inflow = c1.slider("Mean inflow (m³/s)", 10, 200, 60, 5, key="hy_inflow")
+    min_flow = c2.slider("Minimum environmental flow (m³/s)", 0, 40, 10, 1, key="hy_min_flow")
+    turbine_flow = c3.slider("Turbine capacity (m³/s)", 20, 300, int(preset.turbine_flow), 5,
+                             key=f"hy_turbine_{name}")
+    c4, c5, c6 = st.columns(3)
+    storage = c4.slider("Live storage (hm³)", 0.5, 500.0, preset.storage_hm3, 0.5, key=f"hy_storage_{name}")
+    head_max = c5.slider("Head at full reservoir (m)", 5, 300, int(preset.head_max), 1, key=f"hy_head_{name}")
+    pumped = c6.toggle("Pumped-storage cycling", key=f"hy_pumped_{name}",
+                       help="Pump 00:00–06:00, generate the same water back 17:00–22:00.")
+    pump_flow = c6.slider("Pump flow (m³/s)", 5, 100, 30, 5, key=f"hy_pump_{name}", disabled=not pumped)
+
+    scenario = replace(
+        preset, mean_inflow=mean_inflow, min_flow=min_flow, turbine_flow=turbine_flow,
+        storage_hm3=storage, head_max=head_max,
+        head_min=head_max * preset.head_min / preset.head_max,
+        pumped=pumped, pump_flow=pump_flow,
+    )
+    result = dispatch(scenario)
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Annual generation", f"{result.energy_gwh:,.1f} GWh",
+              help=f"Pumping used {result.pumped_gwh:,.1f} GWh" if pumped else None)
+    m2.metric("Capacity factor", f"{result.capacity_factor:.1%}")
+    m3.metric("Spilled inflow", f"{result.spill_share:.1%}")
+    m4.metric("Hours below minimum flow", f"{result.low_flow_hours:,}")
+
+    day = np.arange(1, HOURS // 24 + 1)
+    left, right = st.columns(2)
+    left.caption("Reservoir storage (hm³, daily mean)")
+    left.line_chart({"Day": day, "Storage (hm³)": daily(result.storage)}, x="Day", y="Storage (hm³)", height=240)
+    right.caption("Flows (m³/s, daily mean)")
+    right.line_chart(
+        {
+            "Day": day,
+            "Inflow": daily(result.inflow),
+            "Turbine release": daily(result.release),
+            "Spill": daily(result.spill),
+        },
+        x="Day", y=["Inflow", "Turbine release", "Spill"], height=240,
+    )
+
+    other = next(n for n in PRESETS if n != name)
+    base = dispatch(replace(PRESETS[other], mean_inflow=mean_inflow, min_flow=min_flow))
+    st.caption(
+        f"For comparison, the default {other.lower()} plant on the same river generates "
+        f"{base.energy_gwh:,.1f} GWh a year and spills {base.spill_share:.0%} of the inflow. "
+        "Power grows with both flow and head (P = ρ g Q h η), so storage that keeps the head "
+        "up and times the release pays twice."
+    )
@@ -0,0 +1,330 @@
+"""Year-long hourly dispatch of a hybrid solar/wind/hydro/biomass microgrid.
+
+Hourly resource profiles for the four technologies (an 8760 x 4 array of
+output per MW installed) and a load profile (normalised to a peak of 1) are
+generated once from the single-system models (by one process at a time, see
+``singleflight``) and saved as ``.npy`` files in ``.cache/series/``. Every
+process opens them with ``mmap_mode="r"``, so all app processes share one copy
+through the OS page cache.
+
+Dispatch follows merit order. Solar, wind and run-of-river hydro are taken
+first; a surplus charges the battery and whatever is left is curtailed. A
+deficit is met from the battery, then from biomass (up to its capacity and
+availability), and the rest is unserved. Only the battery's state of charge
+carries from hour to hour. It is the clamp recursion already used for the
+hydro reservoir, so the whole year runs as one ``clamp_scan`` plus
+element-wise array arithmetic.
+"""
+import io
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+
+from ecoengineer import SYSTEMS, jobs, metrics, singleflight
+from ecoengineer.sim import frozen, quantize
+from ecoengineer.sim.hydro import clamp_scan
+
+SERIES_DIR = Path(__file__).resolve().parent.parent.parent / ".cache" / "series"
+SERIES_VERSION = 1  # bump when the generators below change
+HOURS = 8760
+SEED = 11
+LATITUDE = 20.0  # degrees north
+SOLAR_PERFORMANCE = 0.82  # inverter, wiring, soiling and temperature losses
+ROUND_TRIP = 0.85  # battery
+CACHE_ENTRIES = 256
+STUDY_STEPS = 24  # solar sizes x battery sizes in the trade-off study
+
+SOURCES = ("solar", "wind", "hydro", "biomass", "storage")
+COLORS = ("#FFC107", "#03A9F4", "#2196F3", "#4CAF50", "#9C27B0", "#E53935")
+
+
+@dataclass(frozen=True)
+class Mix:
+    solar_mw: float = 60.0
+    wind_mw: float = 40.0
+    hydro_mw: float = 10.0
+    biomass_mw: float = 15.0
+    storage_mwh: float = 100.0
+    storage_mw: float = 25.0
+    peak_load_mw: float = 50.0
+
+
+@dataclass(frozen=True)
+class Dispatch:
+    served: np.ndarray  # MW, hours x SOURCES
+    unserved: np.ndarray  # MW
+    curtailed: np.ndarray  # MW
+    charge: np.ndarray  # MW drawn from the bus into the battery
+    soc: np.ndarray  # MWh at the end of each hour
+    load: np.ndarray  # MW
+    energy_gwh: dict  # source -> GWh served
+    load_gwh: float
+    unserved_mwh: float
+    unserved_hours: int
+    curtailed_gwh: float
+    curtailed_share: float  # of the variable renewable output
+    capacity_factor: dict  # source -> delivered / (installed * 8760)
+    battery_cycles: float
+
+
+# --- Resource series ---
+def _solar(rng):
+    hours = np.arange(HOURS)
+    doy, hour = hours // 24 + 1, hours % 24 + 0.5
+    decl = np.radians(23.44) * np.sin(2 * np.pi * (284 + doy) / 365)
+    lat = np.radians(LATITUDE)
+    angle = np.radians(15 * (hour - 12))
+    sin_elev = np.sin(lat) * np.sin(decl) + np.cos(lat) * np.cos(decl) * np.cos(angle)
+    clear_sky = np.clip(sin_elev, 0, None) ** 1.15
+    # Cloud cover per day, heavier in the June-September monsoon.
+    monsoon = (doy >= 152) & (doy < 274)
+    daily = rng.beta(5, 2, 366)[doy]
+    clouds = np.where(monsoon, daily * 0.6, daily)
+    return clear_sky * clouds * SOLAR_PERFORMANCE
+
+
+def _wind():
+    from ecoengineer.sim import wind
+
+    turbine = wind.Turbine()
+    speeds = wind.hourly_speeds(wind.Site())
+    return wind.power_kw(speeds, turbine) / turbine.rated_kw
+
+
+def _hydro():
+    from ecoengineer.sim import hydro
+
+    power = hydro.simulate(hydro.PRESETS["Run-of-river"]).power
+    return power / power.max()
+
+
+def _biomass(rng):
+    """Availability: two planned two-week outages plus a few forced outage days."""
+    available = np.ones(HOURS)
+    for start_day in (60, 250):
+        available[start_day * 24:(start_day + 14) * 24] = 0.0
+    for day in rng.choice(365, 6, replace=False):
+        available[day * 24:(day + 1) * 24] = 0.0
+    return available
+
+
+def _load(rng):
+    hours = np.arange(HOURS)
+    doy, hour = hours // 24, hours % 24
+    daily = np.interp(hour, [0, 5, 8, 12, 15, 19, 21, 23], [0.55, 0.5, 0.75, 0.8, 0.78, 1.0, 0.95, 0.65])
+    seasonal = 1 + 0.15 * np.cos(2 * np.pi * (doy - 140) / 365)  # summer cooling peak
+    weekend = np.where(doy % 7 >= 5, 0.9, 1.0)
+    load = daily * seasonal * weekend * rng.normal(1, 0.03, HOURS)
+    return load / load.max()
+
+
+def build_series():
+    """Generate the resource and load arrays (deterministic for a given seed)."""
+    rng = np.random.default_rng(SEED)
+    columns = {"solar": _solar(rng), "wind": _wind(), "hydro": _hydro(), "biomass": _biomass(rng)}
+    resources = np.column_stack([columns[name] for name in SYSTEMS]).astype(np.float32)
+    return resources, _load(rng).astype(np.float32)
+
+
+def _paths():
+    return (SERIES_DIR / f"resources-v{SERIES_VERSION}.npy", SERIES_DIR / f"load-v{SERIES_VERSION}.npy")
+
+
+def _npy(array):
+    buf = io.BytesIO()
+    np.save(buf, array)
+    return buf.getvalue()
+
+
+@st.cache_resource(show_spinner=False)
+def series():
+    """Read-only memory maps of the (8760, 4) resources and (8760,) load."""
+    paths = _paths()
+    if not all(path.exists() for path in paths):
+        with singleflight.file_lock(paths[0]):
+            if not all(path.exists() for path in paths):
+                for path, array in zip(paths, build_series()):
+                    singleflight.write_atomic(path, _npy(array))
+    return tuple(np.load(path, mmap_mode="r") for path in paths)
+
+
+# --- Dispatch ---
+def dispatch(mix):
+    """Merit-order dispatch over the whole year; see the module docstring."""
+    resources, profile = series()
+    load = profile.astype(float) * mix.peak_load_mw
+    capacity = np.array([getattr(mix, f"{name}_mw") for name in SYSTEMS])
+    available = resources * capacity  # MW per source, hours x 4
+    variable = available[:, :3]  # solar, wind, hydro: take or curtail
+    supply = variable.sum(axis=1)
+    surplus = np.maximum(supply - load, 0.0)
+    deficit = np.maximum(load - supply, 0.0)
+
+    eff = np.sqrt(ROUND_TRIP)
+    want = np.minimum(surplus, mix.storage_mw) * eff - np.minimum(deficit, mix.storage_mw) / eff
+    start = mix.storage_mwh / 2
+    soc = clamp_scan(want, 0.0, mix.storage_mwh, start)
+    delta = np.diff(soc, prepend=start)
+    charge = np.maximum(delta, 0.0) / eff
+    discharge = np.maximum(-delta, 0.0) * eff
+
+    remaining = deficit - discharge
+    biomass = np.minimum(remaining, available[:, 3])
+    unserved = remaining - biomass
+    curtailed = surplus - charge
+    # Curtail each variable source in proportion to its output that hour.
+    used = 1 - np.divide(surplus, supply, out=np.zeros_like(supply), where=supply > 0)
+    served = np.column_stack([variable * used[:, None], biomass, discharge])
+
+    totals = served.sum(axis=0)
+    installed = np.append(capacity, mix.storage_mw)
+    vre_total = variable.sum()
+    return Dispatch(
+        served=frozen(served),
+        unserved=frozen(unserved),
+        curtailed=frozen(curtailed),
+        charge=frozen(charge),
+        soc=frozen(soc),
+        load=frozen(load),
+        energy_gwh={name: float(total) / 1000 for name, total in zip(SOURCES, totals)},
+        load_gwh=float(load.sum()) / 1000,
+        unserved_mwh=float(unserved.sum()),
+        unserved_hours=int(np.count_nonzero(unserved > 1e-6)),
+        curtailed_gwh=float(curtailed.sum()) / 1000,
+        curtailed_share=float(curtailed.sum() / vre_total) if vre_total else 0.0,
+        capacity_factor={
+            name: float(total / (mw * HOURS)) if mw else 0.0
+            for name, total, mw in zip(SOURCES, totals, installed)
+        },
+        battery_cycles=float(discharge.sum() / mix.storage_mwh) if mix.storage_mwh else 0.0,
+    )
+
+
+@st.cache_resource(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _dispatch(mix):
+    return dispatch(mix)
+
+
+def run(mix):
+    """Memoized dispatch for the mix, with capacities rounded to 1 MW / 1 MWh."""
+    return _dispatch(Mix(**{field: quantize(value, 1) for field, value in vars(mix).items()}))
+
+
+def tradeoff(mix, steps=STUDY_STEPS):
+    """Unserved and curtailed shares over a grid of solar and battery sizes.
+
+    Solar runs from 0 to 4x the peak load and the battery from 0 to 8 hours of
+    peak load (at a 4-hour power rating), other capacities as in ``mix``.
+    Meant to run as a background job; reports progress per solar size.
+    """
+    solar = np.linspace(0, 4 * mix.peak_load_mw, steps)
+    storage = np.linspace(0, 8 * mix.peak_load_mw, steps)
+    unserved = np.empty((steps, steps))
+    curtailed = np.empty((steps, steps))
+    for i, solar_mw in enumerate(solar):
+        for j, storage_mwh in enumerate(storage):
+            result = dispatch(replace(mix, solar_mw=solar_mw, storage_mwh=storage_mwh,
+                                      storage_mw=storage_mwh / 4))
+            unserved[i, j] = result.unserved_mwh / 1000 / result.load_gwh
+            curtailed[i, j] = result.curtailed_share
+        jobs.report(i + 1, steps, f"Dispatched {(i + 1) * steps} of {steps * steps} mixes")
+    return solar, storage, unserved, curtailed
+
+
+def _study(mix):
+    """The solar/battery trade-off heatmap, computed in the job pool."""
+    job = jobs.submit(tradeoff, mix)
+    if not job.done():
+        jobs.placeholder(job, "Dispatching a year for every mix…")
+        return
+    if job.error is not None:
+        st.error("The study failed; try again in a moment.")
+        return
+    solar, storage, unserved, curtailed = job.result()
+    output = st.radio("Colour", ["Unserved energy (%)", "Curtailed (%)"], horizontal=True, key="mg_study_output")
+    grid = unserved if output.startswith("Unserved") else curtailed
+    dx, dy = (storage[1] - storage[0]) / 2, (solar[1] - solar[0]) / 2
+    y, x = np.meshgrid(solar, storage, indexing="ij")
+    st.vega_lite_chart(
+        {
+            "x": (x - dx).ravel(), "x2": (x + dx).ravel(),
+            "y": (y - dy).ravel(), "y2": (y + dy).ravel(),
+            output: (grid * 100).ravel().round(2),
+        },
+        {
+            "mark": {"type": "rect"},
+            "height": 320,
+            "encoding": {
+                "x": {"field": "x", "type": "quantitative", "title": "Battery energy (MWh, 4-hour rating)"},
+                "x2": {"field": "x2"},
+                "y": {"field": "y", "type": "quantitative", "title": "Solar PV (MW)"},
+                "y2": {"field": "y2"},
+                "color": {"field": output, "type": "quantitative", "scale": {"scheme": "viridis"}},
+            },
+        },
+        use_container_width=True,
+    )
+
+
+# --- Panel ---
+@st.fragment
+def panel():
+    """Capacity controls, the annual balance and a one-week dispatch chart."""
+    metrics.fragment_rerun("microgrid")
+    c1, c2, c3, c4 = st.columns(4)
+    solar = c1.number_input("☀️ Solar PV (MW)", 0, 500, 60, 5, key="mg_solar")
+    wind = c2.number_input("🌪️ Wind (MW)", 0, 500, 40, 5, key="mg_wind")
+    hydro = c3.number_input("💧 Run-of-river hydro (MW)", 0, 200, 10, 1, key="mg_hydro")
+    biomass = c4.number_input("🌱 Biomass (MW)", 0, 200, 15, 1, key="mg_biomass")
+    c5, c6, c7 = st.columns(3)
+    storage_mwh = c5.number_input("🔋 Battery energy (MWh)", 0, 2000, 100, 10, key="mg_storage_mwh")
+    storage_mw = c6.number_input("🔋 Battery power (MW)", 0, 500, 25, 5, key="mg_storage_mw")
+    peak = c7.number_input("🏘️ Peak load (MW)", 1, 500, 50, 1, key="mg_peak")
+
+    mix = Mix(solar, wind, hydro, biomass, storage_mwh, storage_mw, peak)
+    result = run(mix)
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Annual load", f"{result.load_gwh:,.1f} GWh")
+    m2.metric("Unserved energy", f"{result.unserved_mwh:,.0f} MWh",
+              f"{result.unserved_mwh / 1000 / result.load_gwh:.2%} of load, {result.unserved_hours:,} h",
+              delta_color="off")
+    m3.metric("Curtailed", f"{result.curtailed_gwh:,.1f} GWh",
+              f"{result.curtailed_share:.1%} of solar, wind and hydro", delta_color="off")
+    m4.metric("Battery cycles", f"{result.battery_cycles:,.0f} / year")
+
+    left, right = st.columns(2)
+    labels = [name.title() for name in SOURCES]
+    installed = [solar, wind, hydro, biomass, storage_mw]
+    left.caption("Capacity mix (MW installed) and annual energy served (GWh)")
+    left.bar_chart(
+        {
+            "Source": labels,
+            "Installed (MW)": installed,
+            "Served (GWh)": [result.energy_gwh[name] for name in SOURCES],
+        },
+        x="Source", y=["Installed (MW)", "Served (GWh)"], stack=False, height=280,
+    )
+    right.caption("Capacity factor of each source")
+    right.bar_chart(
+        {"Source": labels, "Capacity factor": [result.capacity_factor[name] for name in SOURCES]},
+        x="Source", y="Capacity factor", height=280,
+    )
+
+    week = st.slider("Week", 1, 52, 27, key="mg_week")
+    hours = slice((week - 1) * 168, week * 168)
+    chart = {"Hour": np.arange(hours.start, hours.stop)}
+    for i, label in enumerate(labels):
+        chart[label] = result.served[hours, i]
+    chart["Unserved"] = result.unserved[hours]
+    st.area_chart(chart, x="Hour", y=[*labels, "Unserved"], color=list(COLORS), height=300)
+    st.caption(
+        "The stack adds up to the load each hour. Solar and wind rarely peak when "
+        "demand does, so the battery and the dispatchable biomass fill the gaps and "
+        "cut curtailment."
+    )
+
+    st.markdown("**Solar vs battery trade-off**")
+    if st.toggle("Map the year over 576 solar and battery sizes", key="mg_study"):
+        _study(Mix(**{field: quantize(value, 1) for field, value in vars(mix).items()}))
@@ -0,0 +1,140 @@
+"""PV array I–V / P–V curves from the single-diode model.
+
+For a module of ``CELLS`` series cells the terminal current satisfies
+
+    I = Iph - I0 (exp((V + I Rs) / a) - 1) - (V + I Rs) / Rsh,   a = n Ns k T / q
+
+which is implicit in I. It is solved for every voltage point at once with a
+fixed number of Newton steps on whole arrays, then scaled to the array's
+series/parallel module counts.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import streamlit as st
+
+from ecoengineer import metrics
+from ecoengineer.sim import frozen, quantize
+
+# Datasheet-like 60-cell ~300 W module at STC (1000 W/m², 25 °C).
+ISC = 9.8  # A
+VOC = 38.5  # V
+CELLS = 60
+IDEALITY = 1.0
+RS = 0.2  # ohm
+RSH = 300.0  # ohm
+ALPHA_ISC = 0.0005  # 1/K
+BANDGAP = 1.12  # eV
+AREA = 1.6  # m² per module
+
+K_Q = 8.617333e-5  # Boltzmann constant over electron charge, V/K
+T_REF = 298.15
+G_REF = 1000.0
+
+POINTS = 2000
+NEWTON_STEPS = 30
+PLOT_POINTS = 200
+CACHE_ENTRIES = 512
+
+
+@dataclass(frozen=True)
+class Curves:
+    voltage: np.ndarray  # V, array terminals
+    current: np.ndarray  # A
+    power: np.ndarray  # W
+    v_mp: float
+    i_mp: float
+    p_max: float
+    v_oc: float
+    i_sc: float
+    efficiency: float  # at the maximum power point
+
+    @property
+    def fill_factor(self):
+        return self.p_max / (self.v_oc * self.i_sc) if self.v_oc and self.i_sc else 0.0
+
+
+def module_iv(irradiance, temperature_c, points=POINTS):
+    """Voltage and current arrays for one module."""
+    t = temperature_c + 273.15
+    a = IDEALITY * CELLS * K_Q * t
+    a_ref = IDEALITY * CELLS * K_Q * T_REF
+    i_ph = ISC * irradiance / G_REF * (1 + ALPHA_ISC * (t - T_REF))
+    i0_ref = ISC / np.expm1(VOC / a_ref)
+    i0 = i0_ref * (t / T_REF) ** 3 * np.exp(BANDGAP / (IDEALITY * K_Q) * (1 / T_REF - 1 / t))
+    if i_ph <= 0:
+        zeros = np.zeros(points)
+        return zeros, zeros
+    v_oc = a * np.log1p(i_ph / i0)
+
+    v = np.linspace(0.0, v_oc, points)
+    i = np.full(points, i_ph)
+    for _ in range(NEWTON_STEPS):
+        vd = v + i * RS
+        e = np.exp(vd / a)
+        f = i_ph - i0 * (e - 1) - vd / RSH - i
+        df = -i0 * RS / a * e - RS / RSH - 1
+        i = i - f / df
+    return v, np.clip(i, 0.0, None)
+
+
+@st.cache_resource(max_entries=CACHE_ENTRIES, show_spinner=False)
+def _curves(irradiance, temperature_c, series, parallel):
+    v, i = module_iv(irradiance, temperature_c)
+    voltage, current = v * series, i * parallel
+    power = voltage * current
+    k = int(np.argmax(power))
+    p_max = float(power[k])
+    area = AREA * series * parallel
+    return Curves(
+        voltage=frozen(voltage),
+        current=frozen(current),
+        power=frozen(power),
+        v_mp=float(voltage[k]),
+        i_mp=float(current[k]),
+        p_max=p_max,
+        v_oc=float(voltage[-1]),
+        i_sc=float(current[0]),
+        efficiency=p_max / (irradiance * area) if irradiance else 0.0,
+    )
+
+
+def curves(irradiance, temperature_c, series=1, parallel=1):
+    """Memoized array curves; inputs are quantized to 10 W/m² and 0.5 °C."""
+    return _curves(quantize(irradiance, 10), quantize(temperature_c, 0.5), int(series), int(parallel))
+
+
+# --- Panel ---
+@st.fragment
+def panel():
+    """Sliders and curves; dragging a slider reruns only this fragment."""
+    metrics.fragment_rerun("solar")
+    c1, c2, c3, c4 = st.columns(4)
+    irradiance = c1.slider("Irradiance (W/m²)", 0, 1200, 1000, 50, key="pv_irradiance")
+    temperature = c2.slider("Cell temperature (°C)", -10, 75, 25, 1, key="pv_temperature")
+    series = c3.number_input("Modules in series", 1, 30, 1, key="pv_series")
+    parallel = c4.number_input("Strings in parallel", 1, 20, 1, key="pv_parallel")
+
+    result = curves(irradiance, temperature, series, parallel)
+    m1, m2, m3, m4, m5 = st.columns(5)
+    m1.metric("Max power", f"{result.p_max:,.0f} W")
+    m2.metric("V_mp / I_mp", f"{result.v_mp:.1f} V / {result.i_mp:.2f} A")
+    m3.metric("V_oc", f"{result.v_oc:.1f} V")
+    m4.metric("I_sc", f"{result.i_sc:.2f} A")
+    m5.metric("Efficiency", f"{result.efficiency:.1%}", help=f"Fill factor {result.fill_factor:.2f}")
+
+    step = max(1, len(result.voltage) // PLOT_POINTS)
+    data = {
+        "Voltage (V)": result.voltage[::step],
+        "Current (A)": result.current[::step],
+        "Power (W)": result.power[::step],
+    }
+    left, right = st.columns(2)
+    left.caption("I–V curve")
+    left.line_chart(data, x="Voltage (V)", y="Current (A)", height=260)
+    right.caption("P–V curve")
+    right.line_chart(data, x="Voltage (V)", y="Power (W)", height=260)
+    st.caption(
+        "Short-circuit current scales with irradiance (double the light, double the current); "
+        "voltage falls as the cells heat up."
+    )
@@ -0,0 +1,68 @@
+"""Single-flight builds of the on-disk artifacts in ``.cache/``.
+
+Within one process, Streamlit's caches already let only one thread compute a
+missing key while the others wait for its result. The files under ``.cache/``
+(rendered diagrams, downscaled assets, variant pools, simulation series) are
+shared by every app process, though, so right after a deploy each process
+would build the same file at once. ``build_once`` takes an exclusive lock for
+the target and checks again before building, so one process builds and the
+others wait and then read its result.
+"""
+import hashlib
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: builds may overlap, writes are still atomic
+    fcntl = None
+
+LOCK_DIR = Path(__file__).resolve().parent.parent / ".cache" / "locks"
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive, cross-process lock on ``path`` for the block.
+
+    The lock files live in ``LOCK_DIR``, not next to ``path``, which may be
+    served to browsers.
+    """
+    digest = hashlib.sha256(str(Path(path).resolve()).encode("utf-8")).hexdigest()[:16]
+    LOCK_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_DIR / f"{digest}.lock", "a") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def write_atomic(path, data):
+    """Write ``data`` (bytes) so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def build_once(path, build):
+    """Create ``path`` from ``build()`` unless it already exists.
+
+    ``build`` returns the file's bytes, or None if it cannot build it here.
+    Returns True if this call wrote the file.
+    """
+    path = Path(path)
+    if path.exists():
+        return False
+    with file_lock(path):
+        if path.exists():
+            return False
+        data = build()
+        if data is None:
+            return False
+        write_atomic(path, data)
+    return True
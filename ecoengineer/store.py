@@ -0,0 +1,277 @@
+"""Persistent progress store: SQLite in WAL mode behind a write-behind queue.
+
+Stage transitions only update an in-memory ``{participant: record}`` map; a
+background thread writes everything that changed during the last flush
+interval in a single transaction. With ``synchronous=NORMAL`` in WAL mode that
+is at most one fsync per checkpoint rather than one per click, and repeated
+clicks by the same participant coalesce into one row write. Records are the
+packed ``Progress`` bytes (see ``ecoengineer/progress.py``).
+
+Several server processes can share one database file. Every flush stamps its
+rows with the next value of a commit sequence, and the writer thread also
+polls for rows other processes committed since the last sequence it saw, so
+listeners (the leaderboard) see every process's saves within a flush interval.
+Forgetting a participant writes an empty tombstone record so that it
+propagates the same way.
+
+A save never takes progress back: the record is merged (``Progress.merge``)
+into the participant's queued record, and again into the stored row inside
+the write transaction. Two tabs or processes saving for the same participant
+therefore add up instead of overwriting each other.
+"""
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import streamlit as st
+
+from ecoengineer import progress, resume
+
+DB_PATH = Path(
+    os.environ.get(
+        "ECOENGINEER_DB",
+        Path(__file__).resolve().parent.parent / ".cache" / "progress.sqlite3",
+    )
+)
+FLUSH_INTERVAL = float(os.environ.get("ECOENGINEER_FLUSH_INTERVAL", "1.0"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    participant TEXT PRIMARY KEY,
+    state BLOB NOT NULL,
+    updated REAL NOT NULL,
+    seq INTEGER NOT NULL DEFAULT 0
+)
+"""
+TOMBSTONE = b""
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def merged(record, base):
+    """``record`` advanced to ``base`` wherever that is further along.
+
+    Tombstones are neither merged into nor merged from.
+    """
+    if base is None or base == TOMBSTONE or record == TOMBSTONE:
+        return record
+    prog = progress.Progress.decode(record).merge(progress.Progress.decode(base))
+    return prog.to_bytes()
+
+
+class ProgressStore:
+    """Participant progress keyed by ID, persisted with batched writes."""
+
+    def __init__(self, path=DB_PATH, flush_interval=FLUSH_INTERVAL):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute(SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(progress)")}
+        if "seq" not in columns:
+            self._db.execute("ALTER TABLE progress ADD COLUMN seq INTEGER NOT NULL DEFAULT 0")
+        self._db.execute("CREATE INDEX IF NOT EXISTS progress_seq ON progress (seq)")
+        self._seen_seq = self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM progress").fetchone()[0]
+        self._db_lock = threading.Lock()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._listeners = []
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="progress-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    # --- Public API ---
+    def subscribe(self, listener):
+        """Call ``listener(participant, record)`` on every save (None on forget)."""
+        self._listeners.append(listener)
+
+    def save(self, participant, record):
+        """Queue ``record`` for ``participant``, merged into any queued one;
+        never blocks on disk."""
+        with self._pending_lock:
+            queued = self._pending.get(participant)
+            if queued is not None:
+                record = merged(record, queued[0])
+            self._pending[participant] = (record, time.time())
+        for listener in self._listeners:
+            listener(participant, record)
+
+    def load(self, participant):
+        """Return the latest saved record for ``participant`` or None."""
+        with self._pending_lock:
+            queued = self._pending.get(participant)
+        if queued is not None:
+            return queued[0]
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT state FROM progress WHERE participant = ?", (participant,)
+            ).fetchone()
+        return row[0] if row and row[0] != TOMBSTONE else None
+
+    def forget(self, participant):
+        """Drop all stored progress for ``participant``."""
+        with self._db_lock:
+            with self._pending_lock:
+                self._pending.pop(participant, None)
+            self._write([(participant, TOMBSTONE, time.time())], merge=False)
+        for listener in self._listeners:
+            listener(participant, None)
+
+    def items(self):
+        """Return ``(participant, record)`` for everyone, including queued saves."""
+        with self._db_lock:
+            rows = dict(self._db.execute("SELECT participant, state FROM progress"))
+        with self._pending_lock:
+            rows.update((p, r) for p, (r, _) in self._pending.items())
+        return [(p, r) for p, r in rows.items() if r != TOMBSTONE]
+
+    def flush(self):
+        """Write all queued records in one transaction; return how many.
+
+        If the write fails the batch is queued again, merged with any newer
+        saves made meanwhile, and the error is raised. Listeners hear about
+        rows that came out different after merging with the stored ones.
+        """
+        with self._db_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return 0
+            try:
+                written = self._write([(p, s, t) for p, (s, t) in batch.items()])
+            except BaseException:
+                with self._pending_lock:
+                    for participant, (record, t) in batch.items():
+                        newer = self._pending.get(participant)
+                        if newer is not None:
+                            record, t = merged(newer[0], record), newer[1]
+                        self._pending[participant] = (record, t)
+                raise
+        for participant, record, _ in written:
+            if record != batch[participant][0]:
+                for listener in self._listeners:
+                    listener(participant, record)
+        return len(batch)
+
+    def poll(self):
+        """Notify listeners of rows other processes committed since the last
+        poll; return how many. Participants with a queued save are skipped,
+        since the queued record is newer."""
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT participant, state, seq FROM progress WHERE seq > ? ORDER BY seq",
+                (self._seen_seq,),
+            ).fetchall()
+            if rows:
+                self._seen_seq = rows[-1][2]
+        with self._pending_lock:
+            rows = [(p, s) for p, s, _ in rows if p not in self._pending]
+        for participant, record in rows:
+            for listener in self._listeners:
+                listener(participant, record if record != TOMBSTONE else None)
+        return len(rows)
+
+    def _write(self, rows, merge=True):
+        # Caller holds _db_lock. BEGIN IMMEDIATE takes the database write
+        # lock first, so MAX(seq) + 1 is unique and increases in commit order
+        # across processes, and no other process can change a row between
+        # the merge below and the update. Returns the rows as written.
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            if merge:
+                rows = [
+                    (participant, merged(record, self._stored(participant)), t)
+                    for participant, record, t in rows
+                ]
+            (seq,) = self._db.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM progress").fetchone()
+            self._db.executemany(
+                "INSERT INTO progress (participant, state, updated, seq) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(participant) DO UPDATE SET "
+                "state = excluded.state, updated = excluded.updated, seq = excluded.seq",
+                [row + (seq,) for row in rows],
+            )
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+        if seq == self._seen_seq + 1:
+            # Nothing from other processes in between: skip our own rows on
+            # the next poll.
+            self._seen_seq = seq
+        return rows
+
+    def _stored(self, participant):
+        row = self._db.execute("SELECT state FROM progress WHERE participant = ?", (participant,)).fetchone()
+        return row[0] if row else None
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join(timeout=self.flush_interval + 5)
+        self.flush()
+        with self._db_lock:
+            self._db.close()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            if self._closed:
+                break
+            try:
+                self.flush()
+                self.poll()
+            except Exception:
+                # e.g. "database is locked" past busy_timeout, or a full disk;
+                # the batch stays queued for the next interval.
+                _LOGGER.exception("Progress store flush failed")
+
+
+@st.cache_resource(show_spinner=False)
+def get_store():
+    """The process-wide progress store."""
+    return ProgressStore()
+
+
+# --- Session Glue ---
+def save_session():
+    """Update the URL resume token and queue the progress if a participant is signed in."""
+    prog = progress.get()
+    resume.sync(prog)
+    participant = st.session_state.get("participant")
+    if participant:
+        get_store().save(participant, prog.to_bytes())
+
+
+def stored(participant):
+    """The saved ``Progress`` of ``participant``, or None."""
+    saved = get_store().load(participant) if participant else None
+    return progress.Progress.decode(saved) if saved is not None else None
+
+
+def attach(participant):
+    """Bind this session to ``participant`` and rehydrate saved progress.
+
+    Progress already made in this session is kept: the saved record is merged
+    into it, as ``progress.get()`` does on restore, and the result is saved.
+    """
+    state = st.session_state
+    participant = participant.strip()
+    state.participant = participant
+    if not participant:
+        return
+    saved = stored(participant)
+    if saved is not None:
+        state.progress = progress.get().merge(saved)
+    save_session()
@@ -0,0 +1,85 @@
+"""Shared green theme for the home page and the system pages.
+
+The combined stylesheet (base theme + home or per-system accent rules) is
+built once per process. It is injected as a single element that is byte-for-byte
+identical on every rerun, so Streamlit's ForwardMsg cache (see
+``global.minCachedMessageSize`` in .streamlit/config.toml) sends the browser a
+hash reference instead of the CSS after the first run.
+"""
+import streamlit as st
+
+# Per-system accent colours: (button background, button text).
+ACCENTS = {
+    "solar": ("#FFC107", "black"),
+    "wind": ("#03A9F4", "#fff"),
+    "hydro": ("#2196F3", "#fff"),
+    "biomass": ("#4CAF50", "#fff"),
+}
+
+BASE_CSS = """
+    body { background-color: #f4faf4; font-family: "Segoe UI", Arial, sans-serif; }
+    .header-container {
+        background: linear-gradient(90deg, #2e7d32, #66bb6a);
+        padding: 1.5rem;
+        border-radius: 12px;
+        box-shadow: 0 4px 16px rgba(0,0,0,0.15);
+        text-align: center;
+        margin-bottom: 1.2rem;
+        color: white;
+    }
+    .header-container h1 { font-weight: 800; font-size: 2rem; margin:0; }
+    .header-container p { margin:0.3rem 0 0 0; opacity:0.95; font-size: 1rem; }
+    .stButton>button {
+        background-color: #388e3c; color: #fff; border-radius: 8px;
+        font-weight: 600; border: none; padding: 0.6rem 1.2rem;
+    }
+    .stButton>button:hover { background-color: #2e7d32; }
+"""
+
+HOME_CSS = """
+    .header-container { padding: 2rem; margin-bottom: 1.5rem; }
+    .header-container h1 { font-size: 2.3rem; }
+    .header-container p { margin:0.4rem 0 0 0; font-size: 1.1rem; }
+    .system-card {
+        background: #ffffff;
+        padding: 1.5rem;
+        border-radius: 12px;
+        margin: 1rem 0;
+        text-align: center;
+        border: 1px solid #c8e6c9;
+        transition: all 0.25s ease;
+    }
+    .system-card:hover {
+        transform: translateY(-6px);
+        box-shadow: 0 10px 30px rgba(0,0,0,0.12);
+        border-color: #81c784;
+    }
+    .system-card h3 { margin-bottom: 0.6rem; color:#2e7d32; }
+    .stButton>button { width: 100%; padding: 0.7rem; }
+    .footer {
+        margin-top: 2rem;
+        padding: 1rem;
+        text-align: center;
+        font-size: 0.9rem;
+        color: #33691e;
+        border-top: 1px solid #c8e6c9;
+    }
+"""
+
+PAGE_CSS = """
+    .quiz-container {{ background:#fff; padding:2rem; border-radius:10px; margin-top:1rem; box-shadow:0 4px 12px rgba(0,0,0,0.1); }}
+    .stButton>button {{ background-color: {bg}; color: {fg}; }}
+"""
+
+
+@st.cache_resource(show_spinner=False)
+def stylesheet(accent=None):
+    """Return the full ``<style>`` block; ``accent`` is a ``(bg, fg)`` pair or None for home."""
+    extra = HOME_CSS if accent is None else PAGE_CSS.format(bg=accent[0], fg=accent[1])
+    return f"<style>{BASE_CSS}{extra}</style>"
+
+
+def apply(page_title, page_icon="🌱", accent=None, **page_config):
+    """Configure the page and inject the theme; call first on every page."""
+    st.set_page_config(page_title=page_title, page_icon=page_icon, layout="wide", **page_config)
+    st.markdown(stylesheet(accent), unsafe_allow_html=True)
@@ -0,0 +1,211 @@
+"""Parametric variants of the numeric calculation stages.
+
+Each template below replaces the fixed numbers in one numeric stage (keyed by
+its widget key in ``stages.json``) with parameter ranges. ``build_pools``
+expands every template over the cartesian product of its ranges and computes
+all answers and question texts in bulk with NumPy; the pools are then
+read-only. ``load_pools`` keeps a pickled copy in ``.cache/pools/``, keyed by
+the files the pools are built from, so only the first process after a change
+builds them. NumPy is imported on first use, not with this module.
+
+A session draws its variant by hashing its seed (the Participant ID when set,
+else a random per-session token) with the stage key, so drawing is a single
+hash and an index into a prebuilt tuple, and the same participant always gets
+the same question.
+"""
+import hashlib
+import pickle
+import secrets
+from dataclasses import dataclass, replace
+from pathlib import Path
+from types import MappingProxyType
+from typing import Callable, Optional
+
+import streamlit as st
+
+from ecoengineer import singleflight
+
+POOLS_DIR = Path(__file__).resolve().parent.parent / ".cache" / "pools"
+
+
+@dataclass(frozen=True)
+class Template:
+    params: dict  # name -> np.arange(start, stop, step) arguments
+    fields: Callable  # vectorized (**params) -> {"answer": ..., other text fields}
+    prompt: str
+    hint: str
+    error: str = ""
+    bounds: tuple = ()
+    where: Optional[Callable] = None  # vectorized (**params) -> keep mask
+
+
+@dataclass(frozen=True)
+class Pool:
+    key: str
+    variants: tuple  # quiz.Stage per variant
+    answers: object  # numpy array, aligned with variants
+
+
+TEMPLATES = {
+    # --- Solar ---
+    "s3_val": Template(
+        params={"p": (100, 601, 10), "h": (2, 10.01, 0.5)},
+        fields=lambda p, h: {"wh": p * h, "answer": p * h / 1000},
+        prompt="{p}W panel × {h} h → ? kWh",
+        hint="Hint: {p}×{h}={wh} Wh → {answer} kWh",
+    ),
+    "s6_val": Template(
+        params={"n": (10, 201, 5), "w": (250, 551, 10)},
+        fields=lambda n, w: {"total": n * w, "answer": n * w / 1000},
+        prompt=(
+            "A solar farm has {n} panels, each rated at {w}W. "
+            "What is the total nominal power output (in kW)?"
+        ),
+        hint="Hint: {n}×{w}={total} W → {answer} kW",
+        error="Recheck: {n}×{w} W → ?",
+        bounds=(0.0, 200.0, 1.0),
+    ),
+    # --- Wind ---
+    "w3": Template(
+        params={"p": (500, 2001, 50), "eta": (25, 51)},
+        fields=lambda p, eta: {"ratio": eta / 100, "answer": p * eta / 100},
+        prompt="{p} kW theoretical × {eta}% = ? kW",
+        hint="Hint: {p}×{ratio}",
+    ),
+    "w6_val": Template(
+        params={
+            "p": (1, 5.01, 0.5),
+            "v1": (8, 15),
+            "v2": (4, 13),
+        },
+        fields=lambda p, v1, v2: {"answer": p * (v2 / v1) ** 3},
+        prompt=(
+            "A turbine’s output is {p} MW at {v1} m/s wind. "
+            "What would be its output at {v2} m/s (same efficiency)?"
+        ),
+        hint="Hint: ({v2}/{v1})³ × {p} MW",
+        where=lambda p, v1, v2: v2 < v1,
+    ),
+    # --- Hydro ---
+    "h3": Template(
+        params={"m": (100, 2001, 50), "h": (5, 51)},
+        fields=lambda m, h: {"answer": m * 9.8 * h},
+        prompt="{m} kg @ {h} m; g=9.8 → PE?",
+        hint="Hint: {m}×9.8×{h}",
+    ),
+    "h6_val": Template(
+        params={"p": (5, 251, 5), "t": (2, 25)},
+        fields=lambda p, t: {"answer": p * t},
+        prompt="A plant generates {p} MW. If it operates for {t} hours, how much energy (in MWh)?",
+        hint="Hint: {p}×{t}={answer} MWh",
+        bounds=(0, 6000, 10),
+    ),
+    # --- Biomass ---
+    "b3": Template(
+        params={"p": (50, 501, 10), "eta": (15, 46)},
+        fields=lambda p, eta: {"ratio": eta / 100, "answer": p * eta / 100},
+        prompt="{p} MW input @ {eta}% → output?",
+        hint="Hint: {p}×{ratio}",
+        bounds=(0, 250, 1),
+    ),
+    "b6_val": Template(
+        params={"e": (1000, 5001, 100), "m": (5, 41, 5)},
+        fields=lambda e, m: {"dry": 1 - m / 100, "answer": e / (1 - m / 100)},
+        prompt=(
+            "If 100 kg of biomass contains {e} MJ of energy, and its moisture content "
+            "is {m}%, what is the energy content of the dry biomass?"
+        ),
+        hint="Hint: Energy_dry = {e} / {dry}",
+        bounds=(0, 10000, 50),
+    ),
+}
+
+
+# --- Pools ---
+def build_pool(stage, template):
+    """Expand ``template`` into every variant of ``stage``."""
+    import numpy as np  # deferred: only pages that show a quiz need it
+
+    ranges = [np.arange(*spec) for spec in template.params.values()]
+    grids = np.meshgrid(*ranges, indexing="ij")
+    columns = {name: grid.ravel() for name, grid in zip(template.params, grids)}
+    if template.where is not None:
+        keep = template.where(**columns)
+        columns = {name: col[keep] for name, col in columns.items()}
+    columns.update(template.fields(**columns))
+    answers = columns["answer"].astype(float)
+
+    text = {name: np.char.mod("%g", col).tolist() for name, col in columns.items()}
+    bounds = template.bounds or stage.bounds
+    variants = []
+    for values, answer in zip(zip(*text.values()), answers.tolist()):
+        row = dict(zip(text, values))
+        variants.append(replace(
+            stage,
+            prompt=template.prompt.format_map(row),
+            hint=template.hint.format_map(row),
+            error=template.error.format_map(row) if template.error else stage.error,
+            answer=answer,
+            bounds=bounds,
+        ))
+    return Pool(key=stage.key, variants=tuple(variants), answers=answers)
+
+
+def build_pools(table, templates=TEMPLATES):
+    """``{stage key: Pool}`` for every templated numeric stage in ``table``."""
+    pools = {}
+    for system in table.values():
+        for stage in system.stages:
+            template = templates.get(stage.key)
+            if template is None:
+                continue
+            if stage.kind != "numeric":
+                raise ValueError(f"Template {stage.key!r} targets a {stage.kind} stage")
+            pools[stage.key] = build_pool(stage, template)
+    return MappingProxyType(pools)
+
+
+def load_pools(table, sources):
+    """``build_pools(table)`` through the on-disk copy.
+
+    ``sources`` are the files ``table`` comes from; together with this module
+    they key the copy, so editing a template or a stage rebuilds it.
+    """
+    digest = hashlib.sha256()
+    for source in (__file__, *sources):
+        digest.update(Path(source).read_bytes())
+    path = POOLS_DIR / f"{digest.hexdigest()[:16]}.pickle"
+    singleflight.build_once(
+        path, lambda: pickle.dumps(dict(build_pools(table)), protocol=pickle.HIGHEST_PROTOCOL)
+    )
+    try:
+        return MappingProxyType(pickle.loads(path.read_bytes()))
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        return build_pools(table)
+
+
+# --- Drawing ---
+def index(seed, key, size):
+    """Deterministic variant index for ``seed`` on stage ``key``."""
+    digest = hashlib.blake2b(f"{seed}:{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % size
+
+
+def pick(pools, seed, stage):
+    """Return ``(variant index or None, stage to show)`` for ``seed``."""
+    pool = pools.get(stage.key)
+    if pool is None:
+        return None, stage
+    i = index(seed, stage.key, len(pool.variants))
+    return i, pool.variants[i]
+
+
+def session_seed():
+    """The Participant ID, or a random token kept for the session."""
+    state = st.session_state
+    participant = state.get("participant")
+    if participant:
+        return participant
+    if "question_seed" not in state:
+        state.question_seed = secrets.token_hex(8)
+    return state.question_seed
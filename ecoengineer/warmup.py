@@ -0,0 +1,123 @@
+"""Background warm-up of the heavy, lazily loaded pieces.
+
+Heavy modules (``graphviz``, NumPy) and process-wide caches (stage table,
+variant pools, rendered diagrams, static assets, the simulators' default
+views and the microgrid series) are deferred until a page first needs them,
+which keeps the first page of a fresh container fast. The first script run in
+a process calls ``start()``, which fills those caches in a daemon thread so
+that by the time a visitor opens a system page the work is already done. Each
+task's duration is recorded as ``warmup/<task>`` in ``metrics``.
+
+Visitors who arrive during the warm-up do not build anything twice. A page
+that misses a key the warm-up is still computing waits on Streamlit's per-key
+cache lock. Files under ``.cache/`` (diagrams, variant pools, microgrid series)
+are built by one app process at a time (``singleflight``), and the others read
+them.
+
+Run ``python -m ecoengineer.warmup`` in the container build to bake those files
+into the image, so that even the first process after a deploy only loads them.
+"""
+import logging
+import threading
+import time
+
+from ecoengineer import metrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _stage_table():
+    from ecoengineer import quiz
+
+    quiz.load_stage_table()
+
+
+def _variant_pools():
+    from ecoengineer import quiz
+
+    quiz.load_pools()
+
+
+def _diagrams():
+    from ecoengineer import diagrams
+
+    for dot in diagrams.DIAGRAMS.values():
+        diagrams.render_svg(dot)
+
+
+def _assets():
+    from ecoengineer import assets
+
+    assets.fetch_missing()
+
+
+def _simulators():
+    # The default view of each simulator panel, so opening one is a cache hit.
+    from ecoengineer.sim import biomass, hydro, solar, wind
+
+    solar.curves(1000, 25)
+    turbine, site = wind.Turbine(), wind.Site()
+    wind.energy_yield(turbine, site)
+    for parameter in wind.SWEEPS:
+        wind.sweep(parameter, turbine, site)
+    for preset in hydro.PRESETS.values():
+        hydro.dispatch(preset)
+    plant = biomass.Plant()
+    biomass.result(biomass.DEFAULT_MIX, plant)
+    biomass.heatmap(biomass.DEFAULT_MIX, plant, next(iter(biomass.HEATMAP_AXES)),
+                    next(iter(biomass.HEATMAP_OUTPUTS)))
+
+
+def _microgrid():
+    from ecoengineer.sim import microgrid
+
+    microgrid.series()
+    microgrid.run(microgrid.Mix())
+
+
+TASKS = {
+    "stage_table": _stage_table,
+    "variant_pools": _variant_pools,
+    "diagrams": _diagrams,
+    "assets": _assets,
+    "simulators": _simulators,
+    "microgrid": _microgrid,
+}
+
+
+def run():
+    """Run every warm-up task in order; failures are logged, not raised.
+
+    Returns ``{task: seconds}``.
+    """
+    timings = {}
+    for name, task in TASKS.items():
+        start = time.perf_counter()
+        try:
+            task()
+        except Exception:
+            _LOGGER.exception("Warm-up task %s failed", name)
+        timings[name] = time.perf_counter() - start
+        metrics.REGISTRY.observe("warmup", name, timings[name])
+    return timings
+
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def start():
+    """Start the warm-up thread once per process; returns immediately."""
+    global _started
+    if _started:
+        return
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+        threading.Thread(target=run, name="warmup", daemon=True).start()
+
+
+if __name__ == "__main__":
+    for name, seconds in run().items():
+        print(f"{name:>14}: {seconds * 1000:8.1f} ms")
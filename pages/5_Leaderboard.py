@@ -0,0 +1,59 @@
+import streamlit as st
+
+from ecoengineer import leaderboard, metrics, theme, warmup
+
+metrics.rerun("leaderboard")
+warmup.start()
+
+# --- Page Config & Theme ---
+with metrics.section("leaderboard", "theme"):
+    theme.apply("🏆 Leaderboard", "🏆")
+
+# --- Header ---
+with metrics.section("leaderboard", "header"):
+    st.title("🏆 Live Leaderboard")
+    st.caption(
+        f"Overall out of {leaderboard.OVERALL_MAX}, each system out of {leaderboard.SYSTEM_MAX}. "
+        "Enter your Participant ID on the home page to appear here."
+    )
+
+TABS = {
+    "overall": "🌍 Overall",
+    "solar": "🔆 Solar",
+    "wind": "🌪️ Wind",
+    "hydro": "💧 Hydro",
+    "biomass": "🌱 Biomass",
+}
+
+
+# --- Standings (refreshed in place, page is not rerun) ---
+@st.fragment(run_every=leaderboard.READ_TTL)
+def standings():
+    metrics.fragment_rerun("leaderboard")
+    with metrics.section("leaderboard", "standings"):
+        participant = st.session_state.get("participant")
+        if participant:
+            ranks, total = leaderboard.ranks(participant)
+            cols = st.columns(len(TABS))
+            for col, (key, label) in zip(cols, TABS.items()):
+                rank = ranks[key]
+                col.metric(label, f"#{rank}" if rank else "–", help=f"of {total} participants")
+
+        tables = leaderboard.standings()
+        for tab, key in zip(st.tabs(list(TABS.values())), TABS):
+            max_score = leaderboard.OVERALL_MAX if key == "overall" else leaderboard.SYSTEM_MAX
+            rows = tables[key]
+            if not rows:
+                tab.info("No scores yet.")
+                continue
+            tab.dataframe(
+                [
+                    {"Rank": rank, "Participant": name, "Score": f"{score} / {max_score}"}
+                    for rank, name, score in rows
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+
+
+standings()
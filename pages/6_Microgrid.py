@@ -0,0 +1,30 @@
+import streamlit as st
+
+from ecoengineer import metrics, theme, warmup
+
+metrics.rerun("microgrid")
+warmup.start()
+
+# --- Page Config & Theme ---
+with metrics.section("microgrid", "theme"):
+    theme.apply("⚡ Hybrid Microgrid", "⚡")
+
+# --- Header ---
+with metrics.section("microgrid", "header"):
+    st.title("⚡ Hybrid Microgrid")
+    if st.button("← Back to Home"): st.switch_page("app.py")
+
+# --- Content ---
+with metrics.section("microgrid", "content"):
+    st.markdown("""
+Combine the four systems into one grid and run it for a whole year, hour by hour:
+1. **Solar, wind and run-of-river hydro** are used whenever they produce.
+2. A surplus charges the **battery**; anything left over is **curtailed**.
+3. A shortfall is met by the battery, then by **biomass**; the rest goes **unserved**.
+""")
+
+# --- Simulator ---
+with metrics.section("microgrid", "simulator"):
+    from ecoengineer.sim import microgrid  # loads NumPy on first use
+
+    microgrid.panel()